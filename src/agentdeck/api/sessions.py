@@ -3,6 +3,7 @@
 import html
 import json
 import re
+from dataclasses import asdict
 from pathlib import Path
 
 import structlog
@@ -43,6 +44,15 @@ _STATUS_BAR_RE = re.compile(
     r"|\d+% context left"
     r"|shift\+tab to cycle)"
 )
+# Literal part of each token above; lines containing none of them
+# skip the regex, which otherwise tries every whitespace run.
+_STATUS_BAR_HINTS = ("shortcuts", "context left", "shift+tab to cycle")
+
+
+def _has_status_hint(text: str) -> bool:
+    """True if text may hold a status-bar token worth the regex."""
+    return any(hint in text for hint in _STATUS_BAR_HINTS)
+
 
 # Box-drawing AND ASCII table detection patterns
 _TABLE_TOP_RE = re.compile(r"^[│┌|+][─┬+|\-]+[┐│|+]?\s*$")
@@ -51,6 +61,13 @@ _TABLE_BOT_RE = re.compile(r"^[│└|+][─┴+|\-]+[┘│|+]?\s*$")
 _PANEL_TOP_RE = re.compile(r"^[╭┌][─]+[╮┐]\s*$")
 _PANEL_BOT_RE = re.compile(r"^[╰└][─]+[╯┘]\s*$")
 _PANEL_MID_RE = re.compile(r"^│(.*)│\s*$")
+# Every table/panel pattern above starts with one of these; lines
+# whose first non-blank char is anything else skip straight to the
+# hrule / plain-text branch.
+_BLOCK_START_CHARS = frozenset("│┌├└╭╰|+")
+# Text with none of these (block starts plus hrule chars) cannot
+# contain a table, panel or hrule.
+_MARKUP_CHARS = _BLOCK_START_CHARS | frozenset("─╌╍┄┅┈┉━")
 
 
 def _escape_cell(text: str) -> str:
@@ -188,6 +205,12 @@ def _convert_blocks(lines: list[str]) -> list[str]:
     i = 0
     while i < len(lines):
         line = lines[i]
+        head = line.lstrip()[:1]
+        if head not in _BLOCK_START_CHARS:
+            result.append(_render_line(line))
+            i += 1
+            continue
+
         # Check for multi-column table start
         if _is_table_top(line):
             block, i = _collect_table_block(lines, i)
@@ -245,24 +268,34 @@ def _convert_blocks(lines: list[str]) -> list[str]:
                 continue
             # Not a panel — fall through
 
-        # Regular line — hrule or escaped text
-        if _HRULE_RE.match(line):
-            result.append('<hr class="terminal-hr">')
-        else:
-            escaped = html.escape(line)
-            # Collapse long space runs before status-bar tokens
-            escaped = _STATUS_BAR_RE.sub(r"  \1", escaped)
-            result.append(escaped)
+        result.append(_render_line(line))
         i += 1
 
     return result
 
 
+def _render_line(line: str) -> str:
+    """Render a regular line — hrule or escaped text."""
+    if _HRULE_RE.match(line):
+        return '<hr class="terminal-hr">'
+    escaped = html.escape(line)
+    # Collapse long space runs before status-bar tokens
+    if _has_status_hint(escaped):
+        escaped = _STATUS_BAR_RE.sub(r"  \1", escaped)
+    return escaped
+
+
 def _terminal_to_html(raw: str) -> Markup:
     """Convert raw terminal text to HTML.
 
     Handles horizontal rules, box-drawing tables, and panels.
     """
+    if _MARKUP_CHARS.isdisjoint(raw):
+        # Plain text: escape the whole frame at once unless a
+        # status-bar line still needs its spacing collapsed.
+        escaped = html.escape(raw)
+        if not _has_status_hint(escaped):
+            return Markup(escaped)  # noqa: S704
     lines = raw.split("\n")
     parts = _convert_blocks(lines)
     return Markup("\n".join(parts))  # noqa: S704
@@ -530,7 +563,7 @@ async def get_output(
                 "auto_response_failed",
                 session=session_id,
             )
-    state_json = json.dumps(parsed.model_dump())
+    state_json = json.dumps(asdict(parsed))
     escaped = html.escape(state_json, quote=True)
     oob_div = (
         f'<div id="ui-state-data" hx-swap-oob="true"'
@@ -1,5 +1,8 @@
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from pydantic import AliasChoices, Field, computed_field
 from pydantic_settings import BaseSettings
@@ -16,6 +19,7 @@ class Settings(BaseSettings):
     tmux_pane_width: int = 160
     tmux_pane_height: int = 35
     tmux_scrollback_lines: int = 2_000
+    tmux_socket_name: str | None = None  # None = default tmux socket
     poll_interval_ms: int = 800
 
     # Background capture
@@ -38,6 +42,9 @@ class Settings(BaseSettings):
     # UI behaviour
     confirm_image_upload: bool = False
 
+    # Logging
+    log_level: str = "INFO"
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def db_path(self) -> Path:
@@ -70,31 +77,46 @@ def get_settings() -> Settings:
 def _load_config_file(settings: Settings) -> Settings:
     """Load and merge config.json if it exists."""
     config_path = Path(settings.state_dir) / "config.json"
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
+        return settings
+
+    data = _read_config_file(str(config_path), st.st_mtime_ns, st.st_size)
+    if data is None:
         return settings
+    # model_copy is shallow; copy so nothing aliases the cached dict
+    return settings.model_copy(update=copy.deepcopy(data))
 
+
+@lru_cache(maxsize=4)
+def _read_config_file(path: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    """Parse config.json, expanding ~ in path fields.
+
+    Cached on the file's mtime and size so an unchanged file is
+    parsed once; any edit changes the key and forces a re-read.
+    """
     try:
-        data = json.loads(config_path.read_text())
-        if not isinstance(data, dict):
-            return settings
-
-        # Expand ~ in path fields
-        for key in ("default_working_dir", "state_dir"):
-            if key in data and isinstance(data[key], str):
-                data[key] = str(Path(data[key]).expanduser())
-
-        # Expand ~ in whitelist paths
-        if "rehydrate_dir_whitelist" in data:
-            whitelist = data["rehydrate_dir_whitelist"]
-            if isinstance(whitelist, list):
-                data["rehydrate_dir_whitelist"] = [
-                    str(Path(v).expanduser()) if isinstance(v, str) else v
-                    for v in whitelist
-                ]
-
-        return settings.model_copy(update=data)
+        data = json.loads(Path(path).read_text())
     except Exception:
-        return settings
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    # Expand ~ in path fields
+    for key in ("default_working_dir", "state_dir"):
+        if key in data and isinstance(data[key], str):
+            data[key] = str(Path(data[key]).expanduser())
+
+    # Expand ~ in whitelist paths
+    if "rehydrate_dir_whitelist" in data:
+        whitelist = data["rehydrate_dir_whitelist"]
+        if isinstance(whitelist, list):
+            data["rehydrate_dir_whitelist"] = [
+                str(Path(v).expanduser()) if isinstance(v, str) else v for v in whitelist
+            ]
+
+    return data
 
 
 def override_settings(s: Settings | None) -> None:
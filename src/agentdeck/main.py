@@ -37,7 +37,7 @@ from agentdeck.sessions.tmux_backend import (
     TmuxBackend,
 )
 from agentdeck.sessions.ui_state_detector import (
-    UIStateDetector,
+    parse as parse_ui_state,
 )
 
 logger = structlog.get_logger()
@@ -83,7 +83,7 @@ def _is_whitelisted_session_dir(
         path = Path(working_dir).expanduser().resolve()
     except Exception:
         return False
-    return any(path == allowed or allowed in path.parents for allowed in whitelist_dirs)
+    return any(path.is_relative_to(allowed) for allowed in whitelist_dirs)
 
 
 class _SamplePollingAccess(logging.Filter):
@@ -110,6 +110,24 @@ def _install_access_log_filter() -> None:
     uv_logger.addFilter(filt)
 
 
+def _configure_logging(level: str) -> None:
+    """Drop structlog events below level before any processing.
+
+    Filtered methods become no-ops, so debug logging on the
+    capture loop costs nothing unless it is switched on. An
+    unknown level name falls back to INFO with a warning.
+    """
+    level_no = logging.getLevelNamesMapping().get(level.upper())
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.INFO if level_no is None else level_no
+        ),
+        cache_logger_on_first_use=True,
+    )
+    if level_no is None:
+        logger.warning("unknown_log_level", log_level=level, using="INFO")
+
+
 PKG_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = PKG_DIR / "templates"
 STATIC_DIR = PKG_DIR / "static"
@@ -144,10 +162,13 @@ async def _capture_loop(
     """Background task: capture scrollback + push notify."""
     settings = get_settings()
     interval = settings.capture_interval_s
-    detector = UIStateDetector()
     prev_pane: dict[str, str] = {}
     while True:
         await asyncio.sleep(interval)
+        try:
+            await mgr.refresh_tmux_sessions()
+        except Exception:
+            logger.debug("tmux_refresh_failed")
         for sid in mgr.active_session_ids():
             try:
                 await mgr.capture_to_log(sid)
@@ -158,10 +179,13 @@ async def _capture_loop(
             if notifier is None or tmux is None:
                 continue
             try:
-                pane = await asyncio.to_thread(tmux.capture_pane, sid)
+                # Only the bottom of the pane matters for state
+                # detection; keeping the previous tail (not the full
+                # pane) yields the same last 20 combined lines.
+                pane = await mgr.read_pane_tail(sid, 20)
                 combined = prev_pane.get(sid, "") + "\n" + pane
                 tail = "\n".join(combined.split("\n")[-20:])
-                parsed = detector.parse(tail)
+                parsed = parse_ui_state(tail)
                 prev_pane[sid] = pane
                 asyncio.create_task(
                     _send_push(
@@ -183,6 +207,7 @@ async def lifespan(
     app: FastAPI,
 ) -> AsyncGenerator[None]:
     settings = get_settings()
+    _configure_logging(settings.log_level)
     _install_access_log_filter()
     logger.info("starting_up", version=settings.app_version)
     rehydrate_whitelist = _normalize_whitelist_dirs(settings.rehydrate_dir_whitelist)
@@ -191,6 +216,7 @@ async def lifespan(
         pane_width=settings.tmux_pane_width,
         pane_height=settings.tmux_pane_height,
         scrollback_lines=settings.tmux_scrollback_lines,
+        socket_name=settings.tmux_socket_name,
     )
 
     state_dir = Path(settings.state_dir)
@@ -208,12 +234,11 @@ async def lifespan(
     app.state.output_log = output_log
 
     # Rehydrate live sessions from tmux
-    existing_sessions = await asyncio.to_thread(tmux.list_sessions)
+    existing_sessions = await mgr.list_tmux_session_paths()
     live_ids: set[str] = set()
-    for session_id in existing_sessions:
+    for session_id, working_dir in existing_sessions.items():
         if not session_id.startswith("agent-"):
             continue
-        working_dir = await asyncio.to_thread(tmux.get_session_path, session_id)
         if not _is_whitelisted_session_dir(working_dir, rehydrate_whitelist):
             logger.info(
                 "rehydrate_session_skipped_not_whitelisted",
@@ -284,6 +309,7 @@ async def lifespan(
         await capture_task
     except asyncio.CancelledError:
         pass
+    mgr.close()
     output_log.close()
     logger.info("shutting_down")
 
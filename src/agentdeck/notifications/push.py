@@ -67,9 +67,11 @@ class PushNotifier:
                 "url": f"{public_url}/?session={session_id}",
             }
         )
-        for sub in subs:
-            if self._send_one(sub, payload):
-                sent += 1
+        # Expired endpoints found in this fan-out cost one file write
+        with self._store.batch():
+            for sub in subs:
+                if self._send_one(sub, payload):
+                    sent += 1
         return sent
 
     def _send_one(self, sub: PushSubscription, payload: str) -> bool:
@@ -1,6 +1,8 @@
 """JSON-file-backed push subscription store."""
 
 import json
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
@@ -26,6 +28,8 @@ class PushSubscriptionStore:
     def __init__(self, path: str | Path) -> None:
         self._path = Path(path)
         self._subs: list[PushSubscription] = []
+        self._batch_depth = 0
+        self._dirty = False
         self._load()
 
     def _load(self) -> None:
@@ -38,7 +42,26 @@ class PushSubscriptionStore:
         except (json.JSONDecodeError, OSError, TypeError):
             self._subs = []
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer writes to disk until the outermost batch exits.
+
+        Use around several changes in a row so the file is
+        rewritten once instead of after each change.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._save()
+
     def _save(self) -> None:
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._path.write_text(json.dumps([asdict(s) for s in self._subs], indent=2))
 
@@ -2,6 +2,7 @@
 
 import sqlite3
 import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -72,28 +73,55 @@ END;
 """
 
 
+def _is_memory_db(db_path: Path | str) -> bool:
+    """True for ":memory:" or a "file:...?mode=memory" URI."""
+    if isinstance(db_path, Path):
+        return False
+    if db_path == ":memory:":
+        return True
+    return db_path.startswith("file:") and "mode=memory" in db_path.partition("?")[2]
+
+
 class AgentOutputLog:
     """Append-only output log stored in SQLite with FTS5.
 
     Thread-safe: each call opens its own connection or
     reuses a cached one. Use WAL mode for concurrent
     reads during writes.
+
+    db_path may also be ":memory:" or a "file:...?mode=memory"
+    URI string, which keeps the log entirely in memory (tests).
+    Any other string is treated as a file path.
     """
 
-    def __init__(self, db_path: Path) -> None:
-        self._db_path = db_path
+    def __init__(
+        self,
+        db_path: Path | str,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._db_path = db_path if _is_memory_db(db_path) else Path(db_path)
+        self._clock = clock
         self._conn: sqlite3.Connection | None = None
 
     def _connect(self) -> sqlite3.Connection:
         if self._conn is not None:
             return self._conn
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(
-            str(self._db_path),
-            check_same_thread=False,
-        )
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
+        if isinstance(self._db_path, Path):
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self._db_path),
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            conn = sqlite3.connect(
+                self._db_path,
+                check_same_thread=False,
+                uri=True,
+            )
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
         conn.executescript(_SCHEMA)
         conn.executescript(_FTS_SCHEMA)
         conn.executescript(_FTS_TRIGGERS)
@@ -108,7 +136,22 @@ class AgentOutputLog:
         content = "\n".join(lines)
         conn.execute(
             "INSERT INTO chunks (session_id, ts, content) VALUES (?, ?, ?)",
-            (session_id, time.time(), content),
+            (session_id, self._clock(), content),
+        )
+        conn.commit()
+
+    def append_many(self, session_id: str, chunks: Iterable[list[str]]) -> None:
+        """Insert several chunks for a session in one transaction.
+
+        Each non-empty chunk becomes its own row, stamped in order.
+        """
+        rows = [(session_id, self._clock(), "\n".join(lines)) for lines in chunks if lines]
+        if not rows:
+            return
+        conn = self._connect()
+        conn.executemany(
+            "INSERT INTO chunks (session_id, ts, content) VALUES (?, ?, ?)",
+            rows,
         )
         conn.commit()
 
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import os
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import structlog
@@ -23,7 +27,7 @@ from agentdeck.sessions.models import (
 from agentdeck.sessions.tmux_backend import (
     TmuxBackend,
 )
-from agentdeck.sessions.ui_state_detector import UIStateDetector
+from agentdeck.sessions.ui_state_detector import parse as parse_ui_state
 
 logger = structlog.get_logger()
 
@@ -36,8 +40,8 @@ AGENT_REGISTRY: dict[AgentType, type[BaseAgent]] = {
 class SessionManager:
     """Async orchestrator for agent sessions.
 
-    Wraps synchronous TmuxBackend calls in
-    asyncio.to_thread() to keep FastAPI responsive.
+    Runs synchronous TmuxBackend calls on a dedicated
+    single-thread executor to keep FastAPI responsive.
     """
 
     def __init__(
@@ -48,15 +52,42 @@ class SessionManager:
         capture_tail_lines: int = 300,
     ) -> None:
         self._tmux = tmux
+        # One long-lived worker serializes libtmux access and keeps
+        # tmux calls off the default pool shared with other I/O.
+        self._tmux_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="tmux",
+        )
         self._agents: dict[str, BaseAgent] = {}
+        self._agent_singletons: dict[AgentType, BaseAgent] = {}
         self._sessions: dict[str, SessionInfo] = {}
+        # working_dir -> number of tracked sessions using it
+        self._working_dirs: dict[str, int] = {}
         self._last_output: dict[str, str] = {}
         self._recent_dirs_path = recent_dirs_path
-        self._parser = UIStateDetector()
+        self._recent_dirs: list[str] | None = None
         self._output_log = output_log
         self._capture_tail_lines = capture_tail_lines
         self._last_tail: dict[str, list[str]] = {}
         self._last_history_size: dict[str, int] = {}
+        self._inflight_capture: dict[str, asyncio.Future[str]] = {}
+
+    async def _run[**P, T](
+        self,
+        fn: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Run a blocking TmuxBackend call on the tmux executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._tmux_executor,
+            functools.partial(fn, *args, **kwargs),
+        )
+
+    def close(self) -> None:
+        """Stop the tmux executor."""
+        self._tmux_executor.shutdown(wait=False, cancel_futures=True)
 
     async def create_session(
         self,
@@ -88,16 +119,15 @@ class SessionManager:
                 working_dir=str(path),
             )
 
-        agent_cls = AGENT_REGISTRY.get(agent_type)
-        if agent_cls is None:
+        if agent_type not in AGENT_REGISTRY:
             msg = f"Unsupported agent: {agent_type}"
             raise ValueError(msg)
 
-        agent = agent_cls()
+        agent = self._agent_for_type(agent_type)
         session_id = self._build_session_id(path, title, agent_type)
         command = agent.launch_command(str(path))
 
-        await asyncio.to_thread(
+        await self._run(
             self._tmux.create_session,
             session_id,
             command,
@@ -108,7 +138,7 @@ class SessionManager:
             agent_type=agent_type,
             working_dir=str(path),
         )
-        self._sessions[session_id] = info
+        self._track_session(info)
         self._agents[session_id] = agent
         await asyncio.to_thread(self._record_recent_dir, str(path))
         return info
@@ -125,7 +155,10 @@ class SessionManager:
         """
         self._require_alive_session(session_id)
 
-        agent = self._get_agent(session_id)
+        # Fast path: one lookup for the cached agent
+        agent = self._agents.get(session_id)
+        if agent is None:
+            agent = self._get_agent(session_id)
         expanded = agent.expand_shortcut(text)
         if expanded is not None:
             keys, enter = expanded
@@ -135,22 +168,25 @@ class SessionManager:
                 shortcut=text,
                 keys=keys,
             )
-            await asyncio.to_thread(
+            await self._run(
                 self._tmux.send_keys,
                 session_id,
                 keys,
                 enter=enter,
             )
         else:
-            await asyncio.to_thread(
+            # Fresh baseline: a cached one may predate pane changes,
+            # letting the settle wait end before the text echoes.
+            baseline = await self._run(self._tmux.capture_pane, session_id)
+            await self._run(
                 self._tmux.send_keys,
                 session_id,
                 text,
                 enter=False,
                 literal=True,
             )
-            await asyncio.sleep(0.15)
-            await asyncio.to_thread(
+            await self._await_pane_quiet(session_id, baseline)
+            await self._run(
                 self._tmux.send_keys,
                 session_id,
                 "Enter",
@@ -160,6 +196,9 @@ class SessionManager:
     async def capture_output(self, session_id: str) -> SessionOutput:
         """Capture pane content and diff against last.
 
+        Concurrent callers for the same session share a single
+        in-flight tmux capture instead of each spawning their own.
+
         Args:
             session_id: Target session.
 
@@ -168,7 +207,18 @@ class SessionManager:
         """
         self._require_session(session_id)
 
-        content = await asyncio.to_thread(self._tmux.capture_pane, session_id)
+        fut = self._inflight_capture.get(session_id)
+        if fut is None:
+            fut = asyncio.ensure_future(self._run(self._tmux.capture_pane, session_id))
+            self._inflight_capture[session_id] = fut
+
+            def _clear(done: asyncio.Future[str]) -> None:
+                if self._inflight_capture.get(session_id) is done:
+                    del self._inflight_capture[session_id]
+
+            fut.add_done_callback(_clear)
+        # Shield so one cancelled caller doesn't cancel the others
+        content = await asyncio.shield(fut)
         previous = self._last_output.get(session_id, "")
         changed = content != previous
         self._last_output[session_id] = content
@@ -179,6 +229,33 @@ class SessionManager:
             changed=changed,
         )
 
+    async def read_pane_tail(self, session_id: str, lines: int) -> str:
+        """Capture the bottom of the pane without updating change tracking."""
+        return await self._run(self._tmux.capture_pane_tail, session_id, lines)
+
+    async def refresh_tmux_sessions(self) -> None:
+        """Refresh the backend's session cache in one tmux call.
+
+        Call before iterating over sessions so per-session
+        lookups don't each query tmux.
+        """
+        await self._run(self._tmux.prime_cache)
+
+    async def list_tmux_session_paths(self) -> dict[str, str | None]:
+        """Map every tmux session name to its pane working directory.
+
+        Runs on the tmux executor in one hop; list_sessions primes
+        the backend cache, so the path lookups query tmux no further.
+        """
+
+        def collect() -> dict[str, str | None]:
+            return {
+                name: self._tmux.get_session_path(name)
+                for name in self._tmux.list_sessions()
+            }
+
+        return await self._run(collect)
+
     def active_session_ids(self) -> list[str]:
         """Session IDs that are alive (for capture loop)."""
         return [sid for sid, info in self._sessions.items() if info.is_alive]
@@ -195,13 +272,13 @@ class SessionManager:
         if self._output_log is None:
             return
 
-        alive = await asyncio.to_thread(self._tmux.is_alive, session_id)
+        alive = await self._run(self._tmux.is_alive, session_id)
         if not alive:
             logger.info("session_gone", session=session_id)
             self._mark_dead(session_id)
             return
 
-        dead = await asyncio.to_thread(self._tmux.is_process_dead, session_id)
+        dead = await self._run(self._tmux.is_process_dead, session_id)
         if dead:
             logger.info(
                 "capture_process_dead",
@@ -210,12 +287,12 @@ class SessionManager:
             await self._capture_final(session_id)
             return
 
-        history_size = await asyncio.to_thread(self._tmux.get_history_size, session_id)
+        history_size = await self._run(self._tmux.get_history_size, session_id)
         prev_size = self._last_history_size.get(session_id)
         if prev_size is not None and history_size == prev_size:
             return  # nothing scrolled
 
-        lines = await asyncio.to_thread(self._tmux.capture_scrollback, session_id)
+        lines = await self._run(self._tmux.capture_scrollback, session_id)
         scrollback = lines[:history_size]
 
         if not scrollback:
@@ -236,7 +313,7 @@ class SessionManager:
 
     async def _capture_final(self, session_id: str) -> None:
         """Final full capture on process death."""
-        lines = await asyncio.to_thread(self._tmux.capture_scrollback, session_id)
+        lines = await self._run(self._tmux.capture_scrollback, session_id)
         prev = self._last_tail.get(session_id)
         if prev:
             idx = self._find_overlap(prev, lines)
@@ -255,7 +332,7 @@ class SessionManager:
             had_prev=prev is not None,
         )
 
-        await asyncio.to_thread(self._tmux.kill_session, session_id)
+        await self._run(self._tmux.kill_session, session_id)
         self._mark_dead(session_id)
         self._last_tail.pop(session_id, None)
         self._last_history_size.pop(session_id, None)
@@ -281,6 +358,20 @@ class SessionManager:
             return 0
         fingerprint = previous[-fp_size:]
         limit = len(current) - fp_size + 1
+        if fp_size == 5:
+            # Unrolled compare: no slice per position, and most
+            # positions bail out on the first element.
+            a, b, c, d, e = fingerprint
+            for i in range(limit):
+                if (
+                    current[i] == a
+                    and current[i + 1] == b
+                    and current[i + 2] == c
+                    and current[i + 3] == d
+                    and current[i + 4] == e
+                ):
+                    return i + 5
+            return -1
         for i in range(limit):
             if current[i : i + fp_size] == fingerprint:
                 return i + fp_size
@@ -288,14 +379,14 @@ class SessionManager:
 
     def parse_output(self, raw: str) -> ParsedOutput:
         """Parse raw terminal output into UI state."""
-        return self._parser.parse(raw)
+        return parse_ui_state(raw)
 
     async def send_raw_keys(
         self, session_id: str, keys: str, *, enter: bool = False
     ) -> None:
         """Send raw keys to a session without shortcut expansion."""
         self._require_alive_session(session_id)
-        await asyncio.to_thread(
+        await self._run(
             self._tmux.send_keys,
             session_id,
             keys,
@@ -314,7 +405,7 @@ class SessionManager:
         self._require_alive_session(session_id)
         await asyncio.to_thread(copy_image_to_clipboard, path, fmt)
         await asyncio.sleep(0.1)
-        await asyncio.to_thread(
+        await self._run(
             self._tmux.send_keys,
             session_id,
             "C-v",
@@ -339,8 +430,8 @@ class SessionManager:
         """
         self._require_alive_session(session_id)
 
-        raw = await asyncio.to_thread(self._tmux.capture_pane, session_id)
-        parsed = self._parser.parse(raw)
+        raw = await self._run(self._tmux.capture_pane, session_id)
+        parsed = parse_ui_state(raw)
 
         # Find target index (0-based) from item_number
         target_index = None
@@ -358,41 +449,34 @@ class SessionManager:
             delta = target_index - parsed.selected_index
             key = "Down" if delta > 0 else "Up"
             for _ in range(abs(delta)):
-                await asyncio.to_thread(
+                await self._run(
                     self._tmux.send_keys,
                     session_id,
                     key,
                     enter=False,
                 )
                 await asyncio.sleep(0.05)
-            await asyncio.sleep(0.15)
-            await asyncio.to_thread(
-                self._tmux.send_keys,
-                session_id,
-                "Enter",
-                enter=False,
-            )
         else:
             # Number-input: type the digit then Enter
-            await asyncio.to_thread(
+            await self._run(
                 self._tmux.send_keys,
                 session_id,
                 str(item_number),
                 enter=False,
                 literal=True,
             )
-            await asyncio.sleep(0.15)
-            await asyncio.to_thread(
-                self._tmux.send_keys,
-                session_id,
-                "Enter",
-                enter=False,
-            )
+        settled = await self._await_pane_quiet(session_id, raw)
+        await self._run(
+            self._tmux.send_keys,
+            session_id,
+            "Enter",
+            enter=False,
+        )
 
-        # For freeform: wait then type the text
+        # For freeform: wait for the text input then type
         if freeform_text:
-            await asyncio.sleep(0.2)
-            await asyncio.to_thread(
+            await self._await_pane_quiet(session_id, settled, timeout=0.2)
+            await self._run(
                 self._tmux.send_keys,
                 session_id,
                 freeform_text,
@@ -400,6 +484,45 @@ class SessionManager:
                 literal=True,
             )
 
+    _SETTLE_POLL_S = 0.01
+
+    async def _await_pane_quiet(
+        self,
+        session_id: str,
+        baseline: str | None = None,
+        timeout: float = 0.15,
+    ) -> str | None:
+        """Wait for the pane to react to input and stop changing.
+
+        Polls the pane starting at 10 ms with exponential backoff.
+        Returns early once the content differs from baseline and
+        two consecutive captures match; otherwise gives up after
+        timeout, which bounds the wait to the old fixed sleep.
+
+        Args:
+            session_id: Target session.
+            baseline: Pane content captured before sending keys.
+            timeout: Upper bound on the wait, in seconds.
+
+        Returns:
+            The last captured pane content, or baseline if none.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = self._SETTLE_POLL_S
+        previous: str | None = None
+        while (remaining := deadline - loop.time()) > 0:
+            await asyncio.sleep(min(delay, remaining))
+            try:
+                current = await self._run(self._tmux.capture_pane, session_id)
+            except ValueError:
+                break
+            if current == previous and current != baseline:
+                return current
+            previous = current
+            delay *= 2
+        return previous if previous is not None else baseline
+
     async def kill_session(self, session_id: str) -> None:
         """Kill a session and mark it dead.
 
@@ -407,7 +530,7 @@ class SessionManager:
             session_id: Session to kill.
         """
         self._require_session(session_id)
-        await asyncio.to_thread(self._tmux.kill_session, session_id)
+        await self._run(self._tmux.kill_session, session_id)
         self._mark_dead(session_id)
         self._last_output.pop(session_id, None)
         self._last_history_size.pop(session_id, None)
@@ -417,23 +540,23 @@ class SessionManager:
     async def list_sessions(self) -> list[SessionInfo]:
         """List all tracked sessions.
 
-        Only polls tmux for sessions still marked alive.
-        Auto-detects tmux death and marks them dead.
+        Only polls tmux for sessions still marked alive, all in
+        one batched check. Auto-detects tmux death and marks
+        them dead.
         """
-        for sid, info in self._sessions.items():
-            if not info.is_alive:
-                continue
-            alive = await asyncio.to_thread(self._tmux.is_alive, sid)
-            if not alive:
-                self._mark_dead(sid)
+        live = [sid for sid, info in self._sessions.items() if info.is_alive]
+        if live:
+            alive = await self._run(self._tmux.is_alive_many, live)
+            for sid in live:
+                if not alive.get(sid, False):
+                    self._mark_dead(sid)
         return list(self._sessions.values())
 
     async def get_session(self, session_id: str) -> SessionInfo:
         """Get info for a specific session."""
-        self._require_session(session_id)
-        info = self._sessions[session_id]
+        info = self._require_session(session_id)
         if info.is_alive:
-            alive = await asyncio.to_thread(self._tmux.is_alive, session_id)
+            alive = await self._run(self._tmux.is_alive, session_id)
             if not alive:
                 self._mark_dead(session_id)
         return info
@@ -445,23 +568,39 @@ class SessionManager:
             return agent
         info = self._sessions.get(session_id)
         agent_type = info.agent_type if info else AgentType.CLAUDE
-        cls = AGENT_REGISTRY.get(agent_type, ClaudeCodeAgent)
-        agent = cls()
+        if agent_type not in AGENT_REGISTRY:
+            agent_type = AgentType.CLAUDE
+        agent = self._agent_for_type(agent_type)
         self._agents[session_id] = agent
         return agent
 
-    def _require_session(self, session_id: str) -> None:
-        """Raise if session_id is not tracked."""
-        if session_id not in self._sessions:
+    def _agent_for_type(self, agent_type: AgentType) -> BaseAgent:
+        """Return the shared adapter instance for an agent type.
+
+        Adapters hold no per-session state, so one instance per
+        type is reused across all sessions.
+        """
+        agent = self._agent_singletons.get(agent_type)
+        if agent is None:
+            agent = AGENT_REGISTRY[agent_type]()
+            self._agent_singletons[agent_type] = agent
+        return agent
+
+    def _require_session(self, session_id: str) -> SessionInfo:
+        """Return the tracked session, raising if unknown."""
+        info = self._sessions.get(session_id)
+        if info is None:
             msg = f"Unknown session: {session_id}"
             raise KeyError(msg)
+        return info
 
-    def _require_alive_session(self, session_id: str) -> None:
-        """Raise if session is not tracked or is dead."""
-        self._require_session(session_id)
-        if not self._sessions[session_id].is_alive:
+    def _require_alive_session(self, session_id: str) -> SessionInfo:
+        """Return the tracked session, raising if unknown or dead."""
+        info = self._require_session(session_id)
+        if not info.is_alive:
             msg = f"Session ended: {session_id}"
             raise ValueError(msg)
+        return info
 
     def _mark_dead(self, session_id: str) -> None:
         """Mark a session as dead."""
@@ -486,10 +625,7 @@ class SessionManager:
         name_source = title.strip() if title else path.name
         base_name = self._slug_dir_name(name_source)[:20] or "session"
         base = f"agent-{agent_type.value}-{base_name}"
-        working_dir = str(path)
-        has_same_dir = any(
-            info.working_dir == working_dir for info in self._sessions.values()
-        )
+        has_same_dir = str(path) in self._working_dirs
         if not has_same_dir and base not in self._sessions:
             return base
 
@@ -507,22 +643,23 @@ class SessionManager:
         agent_type: AgentType = AgentType.CLAUDE,
     ) -> None:
         """Register a tmux session that already exists."""
-        self._sessions[session_id] = SessionInfo(
-            session_id=session_id,
-            agent_type=agent_type,
-            working_dir=working_dir,
+        self._track_session(
+            SessionInfo(
+                session_id=session_id,
+                agent_type=agent_type,
+                working_dir=working_dir,
+            )
         )
 
     def remove_dead_session(self, session_id: str) -> None:
         """Soft-delete a dead session and its log data."""
-        self._require_session(session_id)
-        info = self._sessions[session_id]
+        info = self._require_session(session_id)
         if info.is_alive:
             msg = f"Session is still alive: {session_id}"
             raise ValueError(msg)
         if self._output_log is not None:
             self._output_log.soft_delete(session_id)
-        self._sessions.pop(session_id, None)
+        self._untrack_session(session_id)
         self._last_output.pop(session_id, None)
         self._agents.pop(session_id, None)
 
@@ -534,14 +671,35 @@ class SessionManager:
         agent_type: AgentType = AgentType.CLAUDE,
     ) -> None:
         """Register a session that is no longer alive."""
-        self._sessions[session_id] = SessionInfo(
-            session_id=session_id,
-            agent_type=agent_type,
-            working_dir=working_dir,
-            is_alive=False,
-            ended_at=ended_at,
+        self._track_session(
+            SessionInfo(
+                session_id=session_id,
+                agent_type=agent_type,
+                working_dir=working_dir,
+                is_alive=False,
+                ended_at=ended_at,
+            )
         )
 
+    def _track_session(self, info: SessionInfo) -> None:
+        """Add or replace a tracked session and index its dir."""
+        self._untrack_session(info.session_id)
+        self._sessions[info.session_id] = info
+        wd = info.working_dir
+        self._working_dirs[wd] = self._working_dirs.get(wd, 0) + 1
+
+    def _untrack_session(self, session_id: str) -> None:
+        """Stop tracking a session and drop its dir from the index."""
+        info = self._sessions.pop(session_id, None)
+        if info is None:
+            return
+        wd = info.working_dir
+        count = self._working_dirs.get(wd, 0) - 1
+        if count > 0:
+            self._working_dirs[wd] = count
+        else:
+            self._working_dirs.pop(wd, None)
+
     def _slug_dir_name(self, name: str) -> str:
         """Sanitize directory name for tmux session ids."""
         result: list[str] = []
@@ -557,28 +715,70 @@ class SessionManager:
 
     def list_recent_dirs(self) -> list[str]:
         """Return recent working directories, newest first."""
-        return self._load_recent_dirs()
+        return list(self._load_recent_dirs())
 
     def _record_recent_dir(self, working_dir: str) -> None:
         home = str(Path.home())
         if working_dir.startswith(home):
             working_dir = "~" + working_dir[len(home) :]
-        recent = self._load_recent_dirs()
-        if working_dir in recent:
-            recent.remove(working_dir)
-        recent.insert(0, working_dir)
+        current = self._load_recent_dirs()
+        recent = [working_dir] + [d for d in current if d != working_dir]
         recent = recent[:10]
+        if recent == current:
+            return
         self._recent_dirs_path.parent.mkdir(parents=True, exist_ok=True)
-        self._recent_dirs_path.write_text("\n".join(recent))
+        # Write to a sibling file and rename so a crash never
+        # leaves a truncated list behind.
+        tmp = self._recent_dirs_path.with_suffix(".tmp")
+        tmp.write_text("\n".join(recent))
+        os.replace(tmp, self._recent_dirs_path)
+        self._recent_dirs = recent
 
     def _load_recent_dirs(self) -> list[str]:
-        if not self._recent_dirs_path.exists():
-            return []
-        return [
-            line.strip()
-            for line in self._recent_dirs_path.read_text().splitlines()
-            if line.strip()
-        ]
+        """Read recent dirs once, then serve from memory."""
+        if self._recent_dirs is None:
+            if self._recent_dirs_path.exists():
+                self._recent_dirs = [
+                    line.strip()
+                    for line in self._recent_dirs_path.read_text().splitlines()
+                    if line.strip()
+                ]
+            else:
+                self._recent_dirs = []
+        return self._recent_dirs
+
+    async def wait_until_ready(
+        self,
+        session_id: str,
+        *,
+        timeout: float = 5.0,
+        initial: float = 0.2,
+    ) -> bool:
+        """Wait for a new session's agent to draw its first frame.
+
+        Polls the pane with exponential backoff (initial, then
+        doubling) until it shows any non-blank content.
+
+        Args:
+            session_id: Target session.
+            timeout: Maximum seconds to wait.
+            initial: First poll delay in seconds.
+
+        Returns:
+            True once content appears, False on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = initial
+        while True:
+            output = await self.capture_output(session_id)
+            if output.content.strip():
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay *= 2
 
     async def send_debug_prompt(
         self,
@@ -620,7 +820,7 @@ class SessionManager:
         )
         await self.send_input(session_id, message)
         await asyncio.sleep(0.3)
-        await asyncio.to_thread(
+        await self._run(
             self._tmux.send_keys,
             session_id,
             "Enter",
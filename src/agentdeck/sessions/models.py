@@ -1,5 +1,11 @@
-"""Pydantic models for session management."""
+"""Models for session management.
 
+Request/response bodies are Pydantic models. Results built on the
+capture/parse hot path are plain slotted dataclasses and are only
+converted to dicts at the API boundary.
+"""
+
+from dataclasses import dataclass, field
 from enum import StrEnum
 
 from pydantic import BaseModel, Field
@@ -42,7 +48,8 @@ class SendInput(BaseModel):
     text: str = Field(description="Text or shortcut name")
 
 
-class SessionOutput(BaseModel):
+@dataclass(slots=True)
+class SessionOutput:
     """Captured terminal output from a session."""
 
     session_id: str
@@ -58,42 +65,26 @@ class UIState(StrEnum):
     PROMPT = "prompt"
 
 
-class SelectionItem(BaseModel):
+@dataclass(slots=True)
+class SelectionItem:
     """A numbered option in a Claude Code selection list."""
 
-    number: int = Field(description="1-based item number")
-    label: str = Field(description="Option label text")
-    description: str = Field(
-        default="",
-        description="Indented description below the label",
-    )
-    is_freeform: bool = Field(
-        default=False,
-        description="Whether this is a freeform text input option",
-    )
+    number: int  # 1-based item number
+    label: str
+    description: str = ""  # indented description below the label
+    is_freeform: bool = False  # freeform text input option
 
 
-class ParsedOutput(BaseModel):
+@dataclass(slots=True)
+class ParsedOutput:
     """Parsed state from raw tmux output."""
 
     state: UIState = UIState.WORKING
-    items: list[SelectionItem] = Field(default_factory=list)
-    selected_index: int = Field(
-        default=0,
-        description="0-based index of the currently selected item",
-    )
-    question: str = Field(
-        default="",
-        description="Question text above the selection list",
-    )
-    arrow_navigable: bool = Field(
-        default=True,
-        description="Selection has ›/❯ marker — use arrows",
-    )
-    auto_response: str | None = Field(
-        default=None,
-        description="Text to auto-send (e.g. perf eval)",
-    )
+    items: list[SelectionItem] = field(default_factory=list)
+    selected_index: int = 0  # 0-based index of the selected item
+    question: str = ""  # question text above the selection list
+    arrow_navigable: bool = True  # ›/❯ marker present — use arrows
+    auto_response: str | None = None  # text to auto-send (e.g. perf eval)
 
 
 class SendSelection(BaseModel):
@@ -1,46 +1,176 @@
 """Thin synchronous wrapper around libtmux.
 
-All methods are synchronous. The SessionManager wraps
-them in asyncio.to_thread() to avoid blocking the event
-loop.
+Sessions are resolved once per cache TTL to their active pane id;
+per-pane operations then run tmux commands against that id through
+the server directly instead of walking libtmux objects.
+
+All methods are synchronous. The SessionManager runs
+them on a dedicated single-thread executor to avoid
+blocking the event loop.
 """
 
+import threading
+import time
+
 import structlog
 from libtmux import Server
-from libtmux._internal.query_list import ObjectDoesNotExist
+
+from agentdeck.sessions.ui_state_detector import SELECTION_WINDOW_LINES
 
 logger = structlog.get_logger()
 
+# One list-sessions row per session: id, name, the active pane of
+# its active window (so captures can target it directly) and that
+# pane's working directory.
+_SESSION_FORMAT = "#{session_id}\t#{session_name}\t#{pane_id}\t#{pane_current_path}"
+
+# stderr prefixes meaning the target itself is gone (an exited
+# server takes every pane with it); any other tmux error is a real
+# failure, not a stale cache entry.
+_MISSING_TARGET_ERRORS = (
+    "can't find pane",
+    "can't find window",
+    "can't find session",
+    "no server running",
+)
+
 
 class TmuxBackend:
     """Manages tmux sessions via libtmux."""
 
+    # libtmux Servers shared by all backends, keyed by socket name
+    # ("" for the default socket).
+    _SERVER_POOL: dict[str, Server] = {}
+    _SERVER_POOL_LOCK = threading.Lock()
+
     def __init__(
         self,
         pane_width: int = 200,
         pane_height: int = 50,
         scrollback_lines: int = 2_000,
+        session_cache_ttl_s: float = 2.0,
+        socket_name: str | None = None,
     ) -> None:
+        if pane_height > SELECTION_WINDOW_LINES:
+            # Taller panes would push selections past the parser's window
+            logger.warning(
+                "tmux_pane_height_clamped",
+                requested=pane_height,
+                max_height=SELECTION_WINDOW_LINES,
+            )
+            pane_height = SELECTION_WINDOW_LINES
         self._pane_width = pane_width
         self._pane_height = pane_height
         self._scrollback_lines = scrollback_lines
-        self._server: Server | None = None
+        self._socket_name = socket_name
+        self._session_cache_ttl_s = session_cache_ttl_s
+        # session name -> (session id, active pane id, pane path)
+        self._session_cache: dict[str, tuple[str, str, str]] = {}
+        self._cache_ts: float | None = None
 
     @property
     def server(self) -> Server:
-        """Lazy-init the libtmux Server."""
-        if self._server is None:
-            self._server = Server()
-        return self._server
+        """Pooled libtmux Server for this backend's socket."""
+        key = self._socket_name or ""
+        server = self._SERVER_POOL.get(key)
+        if server is None:
+            with self._SERVER_POOL_LOCK:
+                server = self._SERVER_POOL.get(key)
+                if server is None:
+                    server = Server(socket_name=self._socket_name)
+                    self._SERVER_POOL[key] = server
+        return server
+
+    def prime_cache(self) -> None:
+        """Refresh the session cache with one list-sessions call.
+
+        Call once before fanning out over many sessions so each
+        lookup hits the cache instead of spawning its own tmux
+        query. Stores plain ids rather than libtmux Session
+        objects, which nothing here needs.
+        """
+        result = self.server.cmd("list-sessions", "-F", _SESSION_FORMAT)
+        sessions: dict[str, tuple[str, str, str]] = {}
+        for row in result.stdout:
+            # Path goes last so a tab inside it stays in one field
+            parts = row.split("\t", 3)
+            if len(parts) != 4:
+                continue
+            session_id, name, pane_id, path = parts
+            sessions[name] = (session_id, pane_id, path)
+        self._session_cache = sessions
+        self._cache_ts = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the session cache so the next lookup refreshes it."""
+        self._cache_ts = None
+
+    def _find_session(self, session_name: str) -> tuple[str, str, str] | None:
+        """Look up (session id, pane id, path) by name; None if missing.
+
+        Served from a short-lived cache of all sessions, refreshed
+        at most once per TTL.
+        """
+        if (
+            self._cache_ts is None
+            or time.monotonic() - self._cache_ts >= self._session_cache_ttl_s
+        ):
+            self.prime_cache()
+        return self._session_cache.get(session_name)
+
+    def _resolve(self, session_name: str) -> str | None:
+        """Active pane id for a session, or None if missing.
 
-    def _find_session(self, session_name: str):
-        """Look up a session by name, returning None if missing."""
+        Uses the session cache, so repeated calls within the TTL
+        cost no tmux queries.
+        """
+        found = self._find_session(session_name)
+        return found[1] if found is not None else None
+
+    def _require_pane(self, session_name: str) -> str:
+        """Like _resolve() but raises if the session is missing.
+
+        Raises:
+            ValueError: If the session does not exist.
+        """
+        pane_id = self._resolve(session_name)
+        if pane_id is None:
+            msg = f"Session not found: {session_name}"
+            raise ValueError(msg)
+        return pane_id
+
+    def _pane_cmd(self, session_name: str, cmd: str, *args: str) -> list[str]:
+        """Run a tmux command against a session's active pane.
+
+        Raises:
+            ValueError: If the session or its pane is gone.
+            RuntimeError: If tmux rejects the command for any
+                other reason.
+        """
+        pane_id = self._require_pane(session_name)
+        result = self.server.cmd(cmd, "-t", pane_id, *args)
+        if result.stderr:
+            err = result.stderr[0]
+            if err.startswith(_MISSING_TARGET_ERRORS):
+                # Pane went away since the cache was filled
+                self.invalidate()
+                msg = f"No active pane: {session_name}"
+                raise ValueError(msg)
+            msg = f"tmux {cmd} failed for {session_name}: {err}"
+            raise RuntimeError(msg)
+        return result.stdout
+
+    def _display(self, session_name: str, fmt: str) -> str | None:
+        """Expand a format for the active pane; None if missing."""
         try:
-            return self.server.sessions.get(
-                session_name=session_name,
-            )
-        except ObjectDoesNotExist:
+            out = self._pane_cmd(session_name, "display-message", "-p", fmt)
+        except ValueError:
             return None
+        return out[0] if out else ""
+
+    def _capture(self, session_name: str, *args: str) -> list[str]:
+        """Run capture-pane on a session's active pane."""
+        return self._pane_cmd(session_name, "capture-pane", "-p", *args)
 
     def create_session(
         self,
@@ -56,25 +186,48 @@ class TmuxBackend:
 
         Returns:
             The session name.
+
+        Raises:
+            ValueError: If tmux refuses to create the session.
         """
-        session = self.server.new_session(
-            session_name=session_name,
-            window_command=window_command,
-            x=self._pane_width,
-            y=self._pane_height,
-        )
-        session.cmd(
+        # One tmux invocation: create the session, then apply the
+        # per-session options via ";" command chaining.
+        result = self.server.cmd(
+            "new-session",
+            "-d",
+            "-P",
+            "-F",
+            "#{session_name}",
+            "-s",
+            session_name,
+            "-x",
+            str(self._pane_width),
+            "-y",
+            str(self._pane_height),
+            window_command,
+            ";",
             "set-option",
+            "-t",
+            session_name,
             "history-limit",
             str(self._scrollback_lines),
+            ";",
+            "set-option",
+            "-t",
+            session_name,
+            "remain-on-exit",
+            "on",
         )
-        session.set_option("remain-on-exit", "on")
+        self.invalidate()
+        if result.stderr:
+            msg = f"Failed to create session {session_name}: {result.stderr[0]}"
+            raise ValueError(msg)
         logger.info(
             "tmux_session_created",
             session=session_name,
             command=window_command,
         )
-        return session.name  # type: ignore[return-value]
+        return result.stdout[0] if result.stdout else session_name
 
     def send_keys(
         self,
@@ -93,15 +246,12 @@ class TmuxBackend:
             literal: Send keys literally (no tmux
                 key-name interpretation).
         """
-        session = self._find_session(session_name)
-        if session is None:
-            msg = f"Session not found: {session_name}"
-            raise ValueError(msg)
-        pane = session.active_pane
-        if pane is None:
-            msg = f"No active pane: {session_name}"
-            raise ValueError(msg)
-        pane.send_keys(keys, enter=enter, literal=literal)
+        if literal:
+            self._pane_cmd(session_name, "send-keys", "-l", keys)
+        else:
+            self._pane_cmd(session_name, "send-keys", keys)
+        if enter:
+            self._pane_cmd(session_name, "send-keys", "Enter")
 
     def capture_scrollback(
         self,
@@ -118,19 +268,8 @@ class TmuxBackend:
         Returns:
             Scrollback lines.
         """
-        session = self._find_session(session_name)
-        if session is None:
-            msg = f"Session not found: {session_name}"
-            raise ValueError(msg)
-        pane = session.active_pane
-        if pane is None:
-            msg = f"No active pane: {session_name}"
-            raise ValueError(msg)
         start = f"-{tail}" if tail is not None else "-"
-        lines: list[str] = pane.capture_pane(  # type: ignore[assignment]
-            start=start,
-        )
-        return lines
+        return self._capture(session_name, "-S", start)
 
     def capture_pane(self, session_name: str) -> str:
         """Capture visible content of the active pane.
@@ -141,16 +280,22 @@ class TmuxBackend:
         Returns:
             The pane text content.
         """
-        session = self._find_session(session_name)
-        if session is None:
-            msg = f"Session not found: {session_name}"
-            raise ValueError(msg)
-        pane = session.active_pane
-        if pane is None:
-            msg = f"No active pane: {session_name}"
-            raise ValueError(msg)
-        lines: list[str] = pane.capture_pane()  # type: ignore[assignment]
-        return "\n".join(lines)
+        return "\n".join(self._capture(session_name))
+
+    def capture_pane_tail(self, session_name: str, lines: int) -> str:
+        """Capture the bottom lines of the visible pane.
+
+        Joins only the requested tail, for callers that parse
+        the bottom of the pane rather than display it.
+
+        Args:
+            session_name: Target session name.
+            lines: Number of lines to keep from the bottom.
+
+        Returns:
+            The last ``lines`` lines of pane text.
+        """
+        return "\n".join(self._capture(session_name)[-lines:])
 
     def kill_session(self, session_name: str) -> None:
         """Kill a tmux session.
@@ -158,14 +303,15 @@ class TmuxBackend:
         Args:
             session_name: Session to kill.
         """
-        session = self._find_session(session_name)
-        if session is None:
+        found = self._find_session(session_name)
+        if found is None:
             logger.warning(
                 "tmux_session_not_found",
                 session=session_name,
             )
             return
-        session.kill()
+        self.server.cmd("kill-session", "-t", found[0])
+        self.invalidate()
         logger.info(
             "tmux_session_killed",
             session=session_name,
@@ -173,13 +319,8 @@ class TmuxBackend:
 
     def get_history_size(self, session_name: str) -> int:
         """Return the number of scrollback lines above the pane."""
-        session = self._find_session(session_name)
-        if session is None:
-            return 0
-        pane = session.active_pane
-        if pane is None:
-            return 0
-        return int(pane.history_size)  # type: ignore[arg-type]
+        value = self._display(session_name, "#{history_size}")
+        return int(value) if value else 0
 
     def is_process_dead(self, session_name: str) -> bool:
         """Check if the pane's process has exited.
@@ -187,43 +328,37 @@ class TmuxBackend:
         Requires remain-on-exit to be set on the session,
         otherwise the pane disappears on process death.
         """
-        session = self._find_session(session_name)
-        if session is None:
-            return False
-        pane = session.active_pane
-        if pane is None:
-            return False
-        return pane.pane_dead_status is not None
+        return self._display(session_name, "#{pane_dead}") == "1"
 
     def is_alive(self, session_name: str) -> bool:
         """Check if a session exists and is running."""
         return self._find_session(session_name) is not None
 
+    def is_alive_many(self, session_names: list[str]) -> dict[str, bool]:
+        """Check several sessions with a single list-sessions call.
+
+        Args:
+            session_names: Sessions to check.
+
+        Returns:
+            Mapping of each name to whether it exists.
+        """
+        self.prime_cache()
+        live = self._session_cache
+        return {name: name in live for name in session_names}
+
     def list_sessions(self) -> list[str]:
         """List all tmux session names."""
-        return [s.name for s in self.server.sessions if s.name is not None]
+        self.prime_cache()
+        return list(self._session_cache)
 
     def get_session_path(self, session_name: str) -> str | None:
-        """Get the current path of the active pane."""
-        session = self._find_session(session_name)
-        if session is None:
-            return None
-        pane = session.active_pane
-        if pane is None:
-            return None
-        current_path = getattr(pane, "current_path", None)
-        if current_path:
-            return current_path
-        try:
-            result = pane.cmd(  # type: ignore[attr-defined]
-                "display-message",
-                "-p",
-                "-t",
-                pane.pane_id,  # type: ignore[attr-defined]
-                "#{pane_current_path}",
-            )
-        except Exception:
+        """Get the current path of the active pane.
+
+        Served from the session cache, so it may lag a directory
+        change by up to the cache TTL.
+        """
+        found = self._find_session(session_name)
+        if found is None:
             return None
-        if getattr(result, "stdout", None):
-            return result.stdout[0]
-        return None
+        return found[2] or None
@@ -1,6 +1,8 @@
 """Parse Claude Code UI state from raw tmux output."""
 
 import re
+from functools import lru_cache
+from typing import Final
 
 from agentdeck.sessions.models import (
     ParsedOutput,
@@ -9,17 +11,17 @@ from agentdeck.sessions.models import (
 )
 
 # Matches numbered list items, with optional › or ❯ marker.
-_ITEM_RE = re.compile(r"^(?P<prefix>\s*[›❯]?\s*)(?P<num>\d+)\.\s+(?P<label>.+)$")
+_ITEM_RE: Final = re.compile(r"^(?P<prefix>\s*[›❯]?\s*)(?P<num>\d+)\.\s+(?P<label>.+)$")
 
 # Horizontal rule made of ─ (box-drawing char)
-_HRULE_RE = re.compile(r"^[\s]*[─╌╍┄┅┈┉━]{3,}[\s]*$")
+_HRULE_RE: Final = re.compile(r"^[\s]*[─╌╍┄┅┈┉━]{3,}[\s]*$")
 
 # Footer line that confirms this is a selection prompt
 # Matches: "Enter to select · ↑/↓ to navigate · Esc to cancel"
 # Also matches: "Enter to confirm · Esc to cancel" (trust prompt)
 # Also matches: "Esc to cancel · Tab to amend" (permission prompt)
 # Also matches: "Press enter to continue" (Codex selection)
-_FOOTER_RE = re.compile(
+_FOOTER_RE: Final = re.compile(
     r"(Enter to (select|confirm)|Esc to cancel)"
     r".*(Esc to cancel|Tab to amend|↑/↓)"
     r"|Press enter to continue",
@@ -27,25 +29,31 @@ _FOOTER_RE = re.compile(
 )
 
 # Freeform indicator — Claude uses "Type something" for free input
-_FREEFORM_HINT = "type something"
+_FREEFORM_HINT: Final = "type something"
 
 # Known spinner characters used by Claude Code status lines.
 # Captured empirically — see scripts/capture_spinners.py
-_SPINNER_CHARS = "·⏺✢✳✶✻✽"
+_SPINNER_CHARS: Final = "·⏺✢✳✶✻✽"
 
 # Status line: spinner char + space + text containing …
 # Examples: "✳ Moonwalking…", "⏺ Reading 1 file…",
 #           "+ Renaming Foo across codebase…"
-_SPINNER_RE = re.compile(rf"^\s*[{_SPINNER_CHARS}]\s+.*\u2026")
+_SPINNER_RE: Final = re.compile(rf"^\s*[{_SPINNER_CHARS}]\s+.*\u2026")
 
 # Codex working line: "• Working (0s • esc to interrupt)"
-_CODEX_WORKING_RE = re.compile(r"^\s*•\s+.*\(\d+s\s*•\s*esc to interrupt\)")
+_CODEX_WORKING_RE: Final = re.compile(r"^\s*•\s+.*\(\d+s\s*•\s*esc to interrupt\)")
 
 # Quality survey: "1: Bad  2: Fine  3: Good  0: Dismiss"
-_SURVEY_RE = re.compile(r"\d:\s*Good\s+0:\s*Dismiss", re.IGNORECASE)
+_SURVEY_RE: Final = re.compile(r"\d:\s*Good\s+0:\s*Dismiss", re.IGNORECASE)
 
 # How many lines from the bottom to search for spinner/perf.
-_BOTTOM_LINES = 5
+_BOTTOM_LINES: Final = 5
+
+# Lines of content (above trailing blank padding) that parse()
+# looks at. Selections sit at the bottom of the pane, so older
+# scrollback never affects the result. TmuxBackend clamps the
+# pane height to this, so a whole visible pane always fits.
+SELECTION_WINDOW_LINES: Final = 60
 
 # Agent chrome lines found at the bottom of the pane.
 # Matched lines are stripped alongside blank lines so
@@ -54,7 +62,7 @@ _BOTTOM_LINES = 5
 #   "82% context left"
 #   "shift+tab to cycle"
 #   "› some placeholder"  (input prompt cursor)
-_CHROME_RE = re.compile(
+_CHROME_RE: Final = re.compile(
     r"\?\s+for\s+shortcuts"
     r"|\d+%\s+context left"
     r"|shift\+tab to cycle"
@@ -62,214 +70,312 @@ _CHROME_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Single-pass line classifier for the selection scan. Fuses the
+# item, hrule and footer patterns so each line costs one regex
+# call. Alternatives are tried in order, so an item line that also
+# contains footer text classifies as an item (see _is_footer).
+_LINE_RE: Final = re.compile(
+    rf"(?P<item>{_ITEM_RE.pattern})"
+    rf"|(?P<hrule>{_HRULE_RE.pattern})"
+    rf"|(?P<footer>.*?(?i:{_FOOTER_RE.pattern}))"
+)
 
-class UIStateDetector:
-    """Detect Claude Code UI state from captured pane text."""
-
-    def parse(self, raw: str) -> ParsedOutput:
-        """Parse raw tmux output into a structured state.
-
-        Detection priority:
-          1. Working — spinner line near bottom
-          2. Selection — numbered list + navigation footer
-          3. Prompt — default fallback
-        """
-        # Debug captures inject </tmux-capture> as a boundary.
-        # Everything before (and including) the tag belongs to
-        # another session — discard it.
-        tag = "</tmux-capture>"
-        tag_pos = raw.rfind(tag)
-        if tag_pos != -1:
-            raw = raw[tag_pos + len(tag) :]
-
-        lines = raw.split("\n")
-
-        # Strip trailing blank lines and agent status-bar
-        # chrome so position checks use actual content bottom.
-        while lines and (not lines[-1].strip() or _CHROME_RE.search(lines[-1])):
-            lines.pop()
-
-        working = self._try_working(lines)
-        if working is not None:
-            return working
-
-        selection = self._try_selection(lines)
-        if selection is not None:
-            return selection
-
-        return ParsedOutput(state=UIState.PROMPT)
-
-    def _try_working(self, lines: list[str]) -> ParsedOutput | None:
-        """Detect working state from spinner near bottom.
-
-        Also detects performance evaluation prompt and sets
-        auto_response to respond automatically.
-        """
-        tail = lines[-_BOTTOM_LINES:]
-
-        # Check for quality survey — auto-dismiss
-        for line in tail:
-            if _SURVEY_RE.search(line):
-                return ParsedOutput(
-                    state=UIState.WORKING,
-                    auto_response="0",
-                )
-
-        # Check for spinner line (Claude or Codex)
-        for line in tail:
-            if _SPINNER_RE.match(line):
-                return ParsedOutput(state=UIState.WORKING)
-            if _CODEX_WORKING_RE.match(line):
-                return ParsedOutput(state=UIState.WORKING)
+# The fused classifier without its footer branch, for lines that
+# fail the footer substring probe.
+_CONTENT_RE: Final = re.compile(
+    rf"(?P<item>{_ITEM_RE.pattern})|(?P<hrule>{_HRULE_RE.pattern})"
+)
 
+# Every footer _FOOTER_RE accepts contains one of these (lowercase).
+_FOOTER_LITERALS: Final = ("enter to", "esc to cancel")
+
+# Line kinds returned by _classify()
+_ITEM: Final = "item"
+_FOOTER: Final = "footer"
+_HRULE: Final = "hrule"
+_BLANK: Final = "blank"
+_DESC: Final = "desc"
+_OTHER: Final = "other"
+
+
+@lru_cache(maxsize=256)
+def _is_chrome(line: str) -> bool:
+    """True if line is blank or agent status-bar chrome.
+
+    Cached: the same few status-bar lines recur on every poll.
+    """
+    return not line.strip() or _CHROME_RE.search(line) is not None
+
+
+def _footer_probe(line: str) -> bool:
+    """Cheap substring check that must pass before _FOOTER_RE can."""
+    low = line.lower()
+    return any(lit in low for lit in _FOOTER_LITERALS)
+
+
+@lru_cache(maxsize=4096)
+def _classify(line: str) -> str:
+    """Classify a pane line for the selection scan.
+
+    Cached: polling re-parses mostly identical panes.
+    """
+    if not line.strip():
+        return _BLANK
+    # Skip the footer branch's full-line scan unless a footer
+    # literal is present.
+    m = (_LINE_RE if _footer_probe(line) else _CONTENT_RE).match(line)
+    if m is None:
+        return _DESC if line.startswith("    ") else _OTHER
+    if m.group("item") is not None:
+        return _ITEM
+    if m.group("hrule") is not None:
+        return _HRULE
+    return _FOOTER
+
+
+@lru_cache(maxsize=1024)
+def _parse_item(line: str) -> tuple[int, str, bool]:
+    """Split an item line into (number, label, has_marker).
+
+    Only call for lines _classify() reports as items.
+    """
+    m = _ITEM_RE.match(line)
+    assert m is not None
+    prefix = m.group("prefix")
+    marker = "›" in prefix or "❯" in prefix
+    return int(m.group("num")), m.group("label").strip(), marker
+
+
+def _is_footer(line: str, kind: str) -> bool:
+    """True if line contains the selection footer."""
+    if kind == _FOOTER:
+        return True
+    return kind == _ITEM and _footer_probe(line) and _FOOTER_RE.search(line) is not None
+
+
+def parse(raw: str) -> ParsedOutput:
+    """Parse raw tmux output into a structured state.
+
+    Detection priority:
+      1. Working — spinner line near bottom
+      2. Selection — numbered list + navigation footer
+      3. Prompt — default fallback
+    """
+    # Debug captures inject </tmux-capture> as a boundary.
+    # Everything before (and including) the tag belongs to
+    # another session — discard it.
+    tag = "</tmux-capture>"
+    tag_pos = raw.rfind(tag)
+    if tag_pos != -1:
+        raw = raw[tag_pos + len(tag) :]
+
+    # Normalise CRLF input (pasted or debug captures) so no
+    # line carries a stray \r into the classifiers.
+    if "\r" in raw:
+        raw = raw.replace("\r\n", "\n")
+
+    # Drop trailing blank lines, then split only the bottom
+    # window instead of the whole scrollback.
+    end = raw.find("\n", len(raw.rstrip()))
+    if end != -1:
+        raw = raw[:end]
+    lines = raw.rsplit("\n", SELECTION_WINDOW_LINES)
+    if len(lines) > SELECTION_WINDOW_LINES:
+        del lines[0]
+
+    # Strip trailing blank lines and agent status-bar
+    # chrome so position checks use actual content bottom.
+    end = len(lines)
+    while end and _is_chrome(lines[end - 1]):
+        end -= 1
+    del lines[end:]
+
+    # First index of the bottom region both detectors scan.
+    tail_start = max(0, len(lines) - _BOTTOM_LINES)
+
+    working = _try_working(lines, tail_start)
+    if working is not None:
+        return working
+
+    selection = _try_selection(lines, tail_start)
+    if selection is not None:
+        return selection
+
+    return ParsedOutput(state=UIState.PROMPT)
+
+
+def _try_working(lines: list[str], tail_start: int) -> ParsedOutput | None:
+    """Detect working state from spinner near bottom.
+
+    Also detects performance evaluation prompt and sets
+    auto_response to respond automatically.
+    """
+    n = len(lines)
+
+    # Check for quality survey — auto-dismiss
+    for j in range(tail_start, n):
+        if _SURVEY_RE.search(lines[j]):
+            return ParsedOutput(
+                state=UIState.WORKING,
+                auto_response="0",
+            )
+
+    # Check for spinner line (Claude or Codex)
+    for j in range(tail_start, n):
+        line = lines[j]
+        if _SPINNER_RE.match(line):
+            return ParsedOutput(state=UIState.WORKING)
+        if _CODEX_WORKING_RE.match(line):
+            return ParsedOutput(state=UIState.WORKING)
+
+    return None
+
+
+def _try_selection(  # noqa: C901
+    lines: list[str], tail_start: int
+) -> ParsedOutput | None:
+    """Try to parse a numbered selection list.
+
+    Scans bottom-up so stale selections above the current
+    one are never reached. Requires:
+      - 2+ consecutive items numbered 1..N
+      - Bottom-most item at or below tail_start
+      - Either the navigation footer OR a question header
+    """
+    n = len(lines)
+    if n == 0:
         return None
 
-    def _try_selection(self, lines: list[str]) -> ParsedOutput | None:  # noqa: C901
-        """Try to parse a numbered selection list.
-
-        Scans bottom-up so stale selections above the current
-        one are never reached. Requires:
-          - 2+ consecutive items numbered 1..N
-          - Bottom-most item within 5 lines of content end
-          - Either the navigation footer OR a question header
-        """
-        n = len(lines)
-        if n == 0:
-            return None
-
-        # --- Phase 1: bottom-up scan for numbered items ---
-        # Map: item number → (line index, label, has_marker)
-        found: dict[int, tuple[int, str, bool]] = {}
-        bottom_item_idx: int | None = None
-        i = n - 1
-
-        # Skip footer lines at the very bottom
-        while i >= 0:
-            line = lines[i]
-            if not line.strip() or _FOOTER_RE.search(line):
-                i -= 1
-                continue
-            break
+    kinds: list[str] = [_classify(line) for line in lines]
 
-        # Walk upward looking for numbered items
-        prev_item_line: int | None = None
-        while i >= 0:
-            line = lines[i]
-            m = _ITEM_RE.match(line)
-            if m:
-                num = int(m.group("num"))
-                label = m.group("label").strip()
-                prefix = m.group("prefix")
-                marker = "›" in prefix or "❯" in prefix
-
-                if bottom_item_idx is None:
-                    # First item from bottom — must be near end
-                    if i < n - 5:
-                        return None
-                    bottom_item_idx = i
-
-                # Gap check: each item must be within 3 lines
-                # of the previous (lower) item
-                if prev_item_line is not None:
-                    gap = prev_item_line - i
-                    if gap > 3:
-                        break
-
-                found[num] = (i, label, marker)
-                prev_item_line = i
-
-                # Stop once we find item 1
-                if num == 1:
-                    break
-            elif _FOOTER_RE.search(line):
-                pass  # skip inline footer
-            elif not line.strip():
-                pass  # skip blank lines
-            elif _HRULE_RE.match(line):
-                pass  # skip hrules between items
-            elif line.startswith("    "):
-                pass  # skip description lines (collected later)
-            else:
-                # Non-item, non-skip line — gap tolerance
-                # still applies via prev_item_line check above
-                pass
+    # --- Phase 1: bottom-up scan for numbered items ---
+    # Map: item number → (line index, label, has_marker)
+    found: dict[int, tuple[int, str, bool]] = {}
+    bottom_item_idx: int | None = None
+    i = n - 1
 
+    # Skip footer lines at the very bottom
+    while i >= 0:
+        kind = kinds[i]
+        if kind == _BLANK or _is_footer(lines[i], kind):
             i -= 1
+            continue
+        break
+
+    # Walk upward looking for numbered items. Footer, blank,
+    # hrule and description lines are skipped; the gap check
+    # below bounds how far apart items may be.
+    prev_item_line: int | None = None
+    while i >= 0:
+        if kinds[i] == _ITEM:
+            num, label, marker = _parse_item(lines[i])
+
+            if bottom_item_idx is None:
+                # First item from bottom — must be near end
+                if i < tail_start:
+                    return None
+                bottom_item_idx = i
+
+            # Gap check: each item must be within 3 lines
+            # of the previous (lower) item
+            if prev_item_line is not None:
+                gap = prev_item_line - i
+                if gap > 3:
+                    break
 
-        # Must have found item 1 and at least 2 items
-        if 1 not in found or len(found) < 2:
-            return None
+            found[num] = (i, label, marker)
+            prev_item_line = i
 
-        # Build consecutive item list 1..max
-        max_num = max(found)
-        items: list[SelectionItem] = []
-        item_lines: list[int] = []
-        selected_index = 0
-        has_marker = False
-
-        for num in range(1, max_num + 1):
-            if num not in found:
-                return None  # gap in numbering
-            idx, label, marker = found[num]
-            items.append(SelectionItem(number=num, label=label))
-            item_lines.append(idx)
-            if marker:
-                selected_index = len(items) - 1
-                has_marker = True
-
-        # --- Phase 2: forward pass for descriptions ---
-        for pos, item in enumerate(items):
-            start = item_lines[pos] + 1
-            end = item_lines[pos + 1] if pos + 1 < len(items) else n
-            for j in range(start, end):
-                line = lines[j]
-                if _ITEM_RE.match(line) or _FOOTER_RE.search(line):
-                    break
-                if _HRULE_RE.match(line) or not line.strip():
-                    continue
-                if line.startswith("    "):
-                    desc = line.strip()
-                    if item.description:
-                        item.description += " " + desc
-                    else:
-                        item.description = desc
-
-        # --- Phase 3: validation gates ---
-        has_footer = any(_FOOTER_RE.search(ln) for ln in lines)
-
-        has_question = False
-        first_idx = item_lines[0]
-        for k in range(first_idx - 1, max(first_idx - 3, -1), -1):
-            line = lines[k].strip()
-            if not line:
-                continue
-            if line.endswith(("?", ":")):
-                has_question = True
+            # Stop once we find item 1
+            if num == 1:
                 break
 
-        if not has_footer and not has_question:
-            return None
-
-        if not has_marker:
-            selected_index = 0
+        i -= 1
 
-        for item in items:
-            if _FREEFORM_HINT in item.label.lower():
-                item.is_freeform = True
+    # Must have found item 1 and at least 2 items
+    if 1 not in found or len(found) < 2:
+        return None
 
-        # Extract question text above the first item
-        question_lines: list[str] = []
-        first_item_idx = item_lines[0]
-        for k in range(first_item_idx - 1, -1, -1):
-            line = lines[k].strip()
-            if not line or _HRULE_RE.match(lines[k]):
+    # Build consecutive item list 1..max
+    max_num = max(found)
+    items: list[SelectionItem] = []
+    item_lines: list[int] = []
+    selected_index = 0
+    has_marker = False
+
+    for num in range(1, max_num + 1):
+        if num not in found:
+            return None  # gap in numbering
+        idx, label, marker = found[num]
+        items.append(SelectionItem(number=num, label=label))
+        item_lines.append(idx)
+        if marker:
+            selected_index = len(items) - 1
+            has_marker = True
+
+    # --- Phase 2: forward pass for descriptions ---
+    for pos, item in enumerate(items):
+        start = item_lines[pos] + 1
+        end = item_lines[pos + 1] if pos + 1 < len(items) else n
+        for j in range(start, end):
+            kind = kinds[j]
+            if kind in (_ITEM, _FOOTER):
                 break
-            question_lines.insert(0, line)
-
-        return ParsedOutput(
-            state=UIState.SELECTION,
-            items=items,
-            selected_index=selected_index,
-            arrow_navigable=has_marker,
-            question=" ".join(question_lines),
-        )
+            if kind in (_HRULE, _BLANK):
+                continue
+            if kind == _DESC:
+                desc = lines[j].strip()
+                if item.description:
+                    item.description += " " + desc
+                else:
+                    item.description = desc
+
+    # --- Phase 3: validation gates ---
+    has_footer = any(_is_footer(ln, k) for ln, k in zip(lines, kinds, strict=True))
+
+    has_question = False
+    first_idx = item_lines[0]
+    for k in range(first_idx - 1, max(first_idx - 3, -1), -1):
+        if kinds[k] == _BLANK:
+            continue
+        if lines[k].rstrip().endswith(("?", ":")):
+            has_question = True
+            break
+
+    if not has_footer and not has_question:
+        return None
+
+    if not has_marker:
+        selected_index = 0
+
+    for item in items:
+        if _FREEFORM_HINT in item.label.lower():
+            item.is_freeform = True
+
+    # Extract question text above the first item
+    question_lines: list[str] = []
+    first_item_idx = item_lines[0]
+    for k in range(first_item_idx - 1, -1, -1):
+        if kinds[k] in (_BLANK, _HRULE):
+            break
+        question_lines.insert(0, lines[k].strip())
+
+    return ParsedOutput(
+        state=UIState.SELECTION,
+        items=items,
+        selected_index=selected_index,
+        arrow_navigable=has_marker,
+        question=" ".join(question_lines),
+    )
+
+
+class UIStateDetector:
+    """Detect Claude Code UI state from captured pane text.
+
+    Thin wrapper kept for callers that hold a detector object;
+    the work happens in the module-level parse().
+    """
+
+    __slots__ = ()
+
+    parse = staticmethod(parse)
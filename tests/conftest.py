@@ -1,3 +1,5 @@
+import os
+import uuid
 from collections.abc import AsyncGenerator
 
 import httpx
@@ -5,7 +7,19 @@ import pytest
 import pytest_asyncio
 
 from agentdeck.config import Settings, override_settings
-from agentdeck.main import app
+from agentdeck.main import app, lifespan
+from agentdeck.sessions.manager import SessionManager
+from agentdeck.sessions.tmux_backend import TmuxBackend
+
+_TEST_SESSION_PREFIX = "agent-"
+# xdist worker id; tagged into session names so each worker only
+# cleans up its own sessions.
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+
+def _is_own_session(name: str) -> bool:
+    """True for integration test sessions created by this worker."""
+    return name.startswith(_TEST_SESSION_PREFIX) and f"-{_WORKER}-" in name
 
 
 def pytest_collection_modifyitems(config, items):
@@ -32,15 +46,88 @@ def _test_settings(tmp_path):
     override_settings(None)
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def client() -> AsyncGenerator[httpx.AsyncClient]:
-    """Async test client.
+    """Async test client shared by the whole run.
 
-    Test modules should set app.state.session_manager
-    to their own mock before using this client.
+    Holds no per-test state; test modules set app.state.session_manager
+    (or other app.state) to their own mocks per test.
     """
     async with httpx.AsyncClient(
         transport=httpx.ASGITransport(app=app),
         base_url="http://test",
     ) as ac:
         yield ac
+
+
+# ── Integration fixtures (real tmux) ──────────────────────
+
+
+@pytest.fixture(scope="session")
+def tmux_backend():
+    """TmuxBackend shared by the run; kills leftover test sessions."""
+    tmux = TmuxBackend(pane_width=120, pane_height=40)
+    yield tmux
+    for name in tmux.list_sessions():
+        if _is_own_session(name):
+            tmux.kill_session(name)
+
+
+@pytest.fixture(scope="session")
+def test_root(tmp_path_factory):
+    """Temporary directory shared by the run."""
+    return tmp_path_factory.mktemp("agent-test")
+
+
+@pytest.fixture()
+def test_dir(test_root):
+    """Per-test working directory inside the shared root."""
+    # Session ids derive from the dir name, so this tags them
+    # with the worker id.
+    path = test_root / f"{_WORKER}-{uuid.uuid4().hex[:8]}"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture(scope="session")
+def manager(tmux_backend, test_root):
+    """Real SessionManager shared by the run."""
+    recent_dirs_path = test_root / "recent_dirs.txt"
+    mgr = SessionManager(tmux=tmux_backend, recent_dirs_path=recent_dirs_path)
+    yield mgr
+    mgr.close()
+
+
+@pytest.fixture()
+def cleanup_sessions(tmux_backend):
+    """Kill test sessions a test created once it finishes."""
+    before = set(tmux_backend.list_sessions())
+    yield
+    for name in tmux_backend.list_sessions():
+        if _is_own_session(name) and name not in before:
+            tmux_backend.kill_session(name)
+
+
+@pytest.fixture(scope="session")
+def live_settings(tmp_path_factory):
+    """Isolated settings for the run-wide lifespan."""
+    override_settings(Settings(state_dir=str(tmp_path_factory.mktemp("state"))))
+    yield
+    override_settings(None)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def live_client(live_settings, tmux_backend):
+    """HTTP client with real lifespan (capture loop + DB).
+
+    Shared by the run so the lifespan starts and stops once;
+    cleanup_sessions still kills each test's sessions. Depends
+    on tmux_backend so its teardown kills any leftover test
+    sessions after the lifespan exits.
+    """
+    async with lifespan(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as ac:
+            yield ac
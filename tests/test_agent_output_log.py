@@ -1,6 +1,7 @@
 """Tests for AgentOutputLog (SQLite + FTS5)."""
 
-import time
+import itertools
+import uuid
 from collections.abc import Generator
 from pathlib import Path
 
@@ -11,7 +12,9 @@ from agentdeck.sessions.agent_output_log import AgentOutputLog
 
 @pytest.fixture
 def log(tmp_path: Path) -> Generator[AgentOutputLog]:
-    db = AgentOutputLog(tmp_path / "test.db")
+    # Fake clock: each append gets a distinct, increasing timestamp
+    ticks = itertools.count(1)
+    db = AgentOutputLog(tmp_path / "test.db", clock=lambda: 1e9 + next(ticks) * 1e-3)
     yield db
     db.close()
 
@@ -29,6 +32,12 @@ class TestAppend:
         page = log.read("s1")
         assert len(page.chunks) == 0
 
+    def test_append_many_inserts_each_chunk(self, log: AgentOutputLog):
+        log.append_many("s1", [["line1"], [], ["line2", "line3"]])
+        page = log.read("s1")
+        assert [c.content for c in page.chunks] == ["line1", "line2\nline3"]
+        assert page.chunks[0].ts < page.chunks[1].ts
+
     def test_append_multiple_chunks(self, log: AgentOutputLog):
         log.append("s1", ["line1"])
         log.append("s1", ["line2"])
@@ -58,8 +67,6 @@ class TestRead:
         log.append("s1", ["old"])
         old_ts = log.latest_ts("s1")
         assert old_ts is not None
-        # Small delay to ensure different timestamp
-        time.sleep(0.01)
         log.append("s1", ["new"])
         new_ts = log.latest_ts("s1")
         assert new_ts is not None
@@ -87,7 +94,6 @@ class TestRead:
 
     def test_earliest_ts_set(self, log: AgentOutputLog):
         log.append("s1", ["a"])
-        time.sleep(0.01)
         log.append("s1", ["b"])
         page = log.read("s1")
         assert page.earliest_ts is not None
@@ -138,7 +144,6 @@ class TestLatestTs:
     def test_latest_ts_returns_most_recent(self, log: AgentOutputLog):
         log.append("s1", ["old"])
         ts1 = log.latest_ts("s1")
-        time.sleep(0.01)
         log.append("s1", ["new"])
         ts2 = log.latest_ts("s1")
         assert ts1 is not None
@@ -177,3 +182,26 @@ class TestSoftDelete:
         log.soft_delete("s1")
         log.soft_delete("s1")
         assert "s1" not in log.session_ids()
+
+
+class TestInMemory:
+    def test_memory_uri_roundtrip(self):
+        db = AgentOutputLog(f"file:log-{uuid.uuid4().hex}?mode=memory&cache=shared")
+        db.append("s1", ["hello"])
+        assert db.read("s1").chunks[0].content == "hello"
+        db.close()
+
+    def test_memory_dbs_are_isolated(self):
+        a = AgentOutputLog(f"file:log-{uuid.uuid4().hex}?mode=memory&cache=shared")
+        b = AgentOutputLog(f"file:log-{uuid.uuid4().hex}?mode=memory&cache=shared")
+        a.append("s1", ["only in a"])
+        assert b.read("s1").chunks == []
+        a.close()
+        b.close()
+
+    def test_str_file_path_keeps_wal(self, tmp_path: Path):
+        db = AgentOutputLog(str(tmp_path / "test.db"))
+        db.append("s1", ["hello"])
+        # WAL keeps a -wal sidecar next to the file while open
+        assert (tmp_path / "test.db-wal").exists()
+        db.close()
@@ -5,28 +5,22 @@ These tests require:
 - The agent CLI installed and authenticated
 
 Run with: uv run pytest -m integration -v
+In parallel: uv run pytest -m integration -n auto --dist loadgroup
 """
 
 import asyncio
-import random
-import shutil
-import string
-from pathlib import Path
 
-import httpx
 import pytest
-import pytest_asyncio
 
-from agentdeck.main import app, lifespan
+from agentdeck.main import app
 from agentdeck.sessions.manager import SessionManager
 from agentdeck.sessions.models import AgentType, ParsedOutput, UIState
-from agentdeck.sessions.tmux_backend import TmuxBackend
 
-# Mark all tests in this module as integration tests
-pytestmark = pytest.mark.integration
+# Integration tests; fixtures live in conftest.py
+pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("cleanup_sessions")]
 
-_TEST_SESSION_PREFIX = "agent-"
 _SELECTION_PROMPT = "ask me a question about tmux and let me select answer"
+_POLL_INTERVAL_S = 0.25
 
 
 async def _wait_for_state(
@@ -37,132 +31,87 @@ async def _wait_for_state(
     retries: int = 15,
     interval: float = 2.0,
 ) -> ParsedOutput:
-    """Poll until the session enters the target UI state."""
-    parsed = None
-    for _ in range(retries):
+    """Poll until the session enters the target UI state.
+
+    Gives up after retries * interval seconds, but samples every
+    _POLL_INTERVAL_S so a match is seen as soon as it appears.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + retries * interval
+    while True:
         output = await mgr.capture_output(session_id)
         parsed = mgr.parse_output(output.content)
-        if parsed.state == target:
-            return parsed
-        await asyncio.sleep(interval)
-    assert parsed is not None
+        if parsed.state == target or loop.time() >= deadline:
+            break
+        await asyncio.sleep(_POLL_INTERVAL_S)
+    if parsed.state == target:
+        return parsed
     msg = f"Expected {target.value}, got {parsed.state.value}"
     raise AssertionError(msg)
 
 
-async def _handle_startup_prompt(mgr: SessionManager, session_id: str) -> None:
-    """Accept the agent's startup trust/approval prompt if shown.
+async def _drive_to_prompt(
+    mgr: SessionManager,
+    session_id: str,
+    *,
+    timeout: float = 10.0,
+) -> ParsedOutput:
+    """Accept the agent's startup prompt, then wait for input.
 
     Claude shows a "trust this folder" selection.
     Codex shows an "approval mode" selection.
-    In both cases, pick the first option to proceed.
+    In both cases, pick the first option to proceed. Each
+    iteration captures once and branches on the parsed state.
     """
-    output = await mgr.capture_output(session_id)
-    parsed = mgr.parse_output(output.content)
-    if parsed.state != UIState.SELECTION:
-        return
-    if parsed.items:
-        await mgr.send_selection(session_id, parsed.items[0].number)
-        await asyncio.sleep(2)
-
-
-# ── Fixtures ──────────────────────────────────────────────
-
-
-@pytest.fixture()
-def tmux_backend():
-    """Shared TmuxBackend with teardown that kills test sessions."""
-    tmux = TmuxBackend(pane_width=120, pane_height=40)
-    yield tmux
-    for name in tmux.list_sessions():
-        if name.startswith(_TEST_SESSION_PREFIX):
-            tmux.kill_session(name)
-
-
-@pytest.fixture()
-def test_dir():
-    """Create a temporary test directory, deleted after test."""
-    project_root = Path(__file__).parent.parent
-    tmp_dir = project_root / "tmp"
-    tmp_dir.mkdir(exist_ok=True)
-
-    suffix = "".join(random.choices(string.ascii_lowercase, k=3))
-    path = tmp_dir / f"agent-test-{suffix}"
-    path.mkdir(exist_ok=True)
-    yield path
-    if path.exists():
-        shutil.rmtree(path)
-
-
-@pytest.fixture()
-def manager(tmux_backend, test_dir):
-    """Create a real SessionManager."""
-    recent_dirs_path = test_dir / "recent_dirs.txt"
-    return SessionManager(tmux=tmux_backend, recent_dirs_path=recent_dirs_path)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    answered = False
+    while True:
+        output = await mgr.capture_output(session_id)
+        parsed = mgr.parse_output(output.content)
+        if parsed.state == UIState.PROMPT:
+            return parsed
+        if parsed.state == UIState.SELECTION and parsed.items and not answered:
+            await mgr.send_selection(session_id, parsed.items[0].number)
+            answered = True
+        if loop.time() >= deadline:
+            break
+        await asyncio.sleep(_POLL_INTERVAL_S)
+    msg = f"Expected {UIState.PROMPT.value}, got {parsed.state.value}"
+    raise AssertionError(msg)
 
 
 # ── Lifecycle tests ──────────────────────────────────────
 
 
-@pytest.mark.asyncio
-async def test_claude_session_lifecycle(manager, test_dir):
-    """Full lifecycle: create, select, confirm selection, kill."""
-    # 1. Create session and wait for startup
-    info = await manager.create_session(working_dir=str(test_dir))
-    sid = info.session_id
-    await asyncio.sleep(3)
-
-    # 2. Handle trust folder prompt if shown
-    await _handle_startup_prompt(manager, sid)
-
-    # 3. Wait for prompt
-    await _wait_for_state(manager, sid, UIState.PROMPT, retries=5, interval=1)
-
-    # 4. Trigger a selection
-    await manager.send_input(sid, _SELECTION_PROMPT)
-    parsed = await _wait_for_state(manager, sid, UIState.SELECTION)
-
-    assert len(parsed.items) > 1
-    assert parsed.arrow_navigable is True
-
-    # 5. Select option 2 → should return to prompt
-    await manager.send_selection(sid, 2)
-    await _wait_for_state(manager, sid, UIState.PROMPT)
-
-    # 6. Verify session is listed
-    sessions = await manager.list_sessions()
-    assert sid in [s.session_id for s in sessions]
-
-    # 7. Kill and verify dead
-    await manager.kill_session(sid)
-    sessions = await manager.list_sessions()
-    dead = next(s for s in sessions if s.session_id == sid)
-    assert not dead.is_alive
-    assert dead.ended_at is not None
-
-
-@pytest.mark.asyncio
-async def test_codex_session_lifecycle(manager, test_dir):
+@pytest.mark.parametrize(
+    "agent_type",
+    [
+        pytest.param(AgentType.CLAUDE, marks=pytest.mark.xdist_group("agent-claude")),
+        pytest.param(AgentType.CODEX, marks=pytest.mark.xdist_group("agent-codex")),
+    ],
+    ids=lambda t: t.value,
+)
+async def test_session_lifecycle(manager, test_dir, agent_type):
     """Full lifecycle: create, select, confirm selection, kill."""
     # 1. Create session and wait for startup
     info = await manager.create_session(
         working_dir=str(test_dir),
-        agent_type=AgentType.CODEX,
+        agent_type=agent_type,
     )
     sid = info.session_id
-    await asyncio.sleep(3)
-
-    # 2. Handle approval mode prompt if shown
-    await _handle_startup_prompt(manager, sid)
+    assert await manager.wait_until_ready(sid)
 
-    # 3. Wait for prompt
-    await _wait_for_state(manager, sid, UIState.PROMPT, retries=5, interval=1)
+    # 2-3. Handle trust / approval prompt if shown, wait for prompt
+    await _drive_to_prompt(manager, sid)
 
     # 4. Trigger a selection
     await manager.send_input(sid, _SELECTION_PROMPT)
     parsed = await _wait_for_state(manager, sid, UIState.SELECTION)
 
     assert len(parsed.items) > 1
+    if agent_type == AgentType.CLAUDE:
+        assert parsed.arrow_navigable is True
 
     # 5. Select option 2 → should return to prompt
     await manager.send_selection(sid, 2)
@@ -180,44 +129,46 @@ async def test_codex_session_lifecycle(manager, test_dir):
     assert dead.ended_at is not None
 
 
-# ── Background capture test ──────────────────────────────
+@pytest.mark.xdist_group("agent-claude")
+async def test_default_agent_answers_trust_prompt(manager, test_dir):
+    """No agent_type starts Claude; its trust prompt is picked by label."""
+    info = await manager.create_session(working_dir=str(test_dir))
+    assert info.agent_type == AgentType.CLAUDE
+    sid = info.session_id
+    assert await manager.wait_until_ready(sid)
+
+    output = await manager.capture_output(sid)
+    parsed = manager.parse_output(output.content)
+    if parsed.state == UIState.SELECTION:
+        trust_item = next(
+            (i for i in parsed.items if "trust" in i.label.lower()),
+            None,
+        )
+        if trust_item:
+            await manager.send_selection(sid, trust_item.number)
 
+    await _wait_for_state(manager, sid, UIState.PROMPT, retries=5, interval=1.0)
 
-@pytest_asyncio.fixture
-async def live_client(tmux_backend):
-    """HTTP client with real lifespan (capture loop + DB).
 
-    Depends on tmux_backend so its teardown kills any
-    leftover test sessions after the lifespan exits.
-    """
-    async with lifespan(app):
-        async with httpx.AsyncClient(
-            transport=httpx.ASGITransport(app=app),
-            base_url="http://test",
-        ) as ac:
-            yield ac
+# ── Background capture test ──────────────────────────────
 
 
-@pytest.mark.asyncio
+@pytest.mark.xdist_group("agent-claude")
 async def test_background_capture_populates_history(live_client, test_dir):
     """Background capture loop persists output to history API."""
     mgr = app.state.session_manager
 
     info = await mgr.create_session(working_dir=str(test_dir))
     sid = info.session_id
-    await asyncio.sleep(3)
-
-    # Handle trust prompt if shown
-    await _handle_startup_prompt(mgr, sid)
-
-    # Wait for prompt, then send a long-output request
-    parsed = await _wait_for_state(mgr, sid, UIState.PROMPT, retries=5, interval=1)
-    if parsed.state == UIState.PROMPT:
-        await mgr.send_input(
-            sid,
-            "write a 60-line python script that prints "
-            "fibonacci numbers with comments on each line",
-        )
+    assert await mgr.wait_until_ready(sid)
+
+    # Handle trust prompt if shown, then send a long-output request
+    await _drive_to_prompt(mgr, sid)
+    await mgr.send_input(
+        sid,
+        "write a 60-line python script that prints "
+        "fibonacci numbers with comments on each line",
+    )
 
     # Wait for output to scroll and capture loop to fire
     for _ in range(15):
@@ -1,6 +1,7 @@
 """Tests for clipboard image copy."""
 
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, mock_open
 
 import pytest
 
@@ -9,41 +10,43 @@ from agentdeck.sessions.clipboard import (
 )
 
 
+@pytest.fixture()
+def clip(monkeypatch):
+    """Patch subprocess.run, shutil.which and sys in one place."""
+    ns = SimpleNamespace(run=MagicMock(), which=MagicMock(), sys=MagicMock())
+    ns.run.return_value.returncode = 0
+    monkeypatch.setattr("agentdeck.sessions.clipboard.subprocess.run", ns.run)
+    monkeypatch.setattr("agentdeck.sessions.clipboard.shutil.which", ns.which)
+    monkeypatch.setattr("agentdeck.sessions.clipboard.sys", ns.sys)
+    return ns
+
+
 class TestMacOS:
     """macOS clipboard via osascript."""
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_png(self, mock_run, mock_sys):
-        mock_sys.platform = "darwin"
-        mock_run.return_value.returncode = 0
+    @pytest.fixture(autouse=True)
+    def _darwin(self, clip):
+        clip.sys.platform = "darwin"
 
+    def test_png(self, clip):
         copy_image_to_clipboard("/tmp/img.png", "png")
 
-        args = mock_run.call_args
+        args = clip.run.call_args
         cmd = args[0][0]
         assert cmd[0] == "osascript"
         script = cmd[2]
         assert "«class PNGf»" in script
         assert "/tmp/img.png" in script
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_jpeg(self, mock_run, mock_sys):
-        mock_sys.platform = "darwin"
-        mock_run.return_value.returncode = 0
-
+    def test_jpeg(self, clip):
         copy_image_to_clipboard("/tmp/img.jpg", "jpeg")
 
-        script = mock_run.call_args[0][0][2]
+        script = clip.run.call_args[0][0][2]
         assert "JPEG picture" in script
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_failure_raises(self, mock_run, mock_sys):
-        mock_sys.platform = "darwin"
-        mock_run.return_value.returncode = 1
-        mock_run.return_value.stderr = "osascript error"
+    def test_failure_raises(self, clip):
+        clip.run.return_value.returncode = 1
+        clip.run.return_value.stderr = "osascript error"
 
         with pytest.raises(RuntimeError, match="osascript"):
             copy_image_to_clipboard("/tmp/img.png", "png")
@@ -52,57 +55,40 @@ class TestMacOS:
 class TestLinux:
     """Linux clipboard via xclip / wl-copy."""
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.shutil.which")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_xclip_png(self, mock_run, mock_which, mock_sys):
-        mock_sys.platform = "linux"
-        mock_which.side_effect = lambda x: "/usr/bin/xclip" if x == "xclip" else None
-        mock_run.return_value.returncode = 0
+    @pytest.fixture(autouse=True)
+    def _linux(self, clip):
+        clip.sys.platform = "linux"
+
+    def test_xclip_png(self, clip):
+        clip.which.side_effect = lambda x: "/usr/bin/xclip" if x == "xclip" else None
 
         copy_image_to_clipboard("/tmp/img.png", "png")
 
-        cmd = mock_run.call_args[0][0]
+        cmd = clip.run.call_args[0][0]
         assert "xclip" in cmd
         assert "image/png" in cmd
         assert "/tmp/img.png" in cmd
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.shutil.which")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_xclip_jpeg(self, mock_run, mock_which, mock_sys):
-        mock_sys.platform = "linux"
-        mock_which.side_effect = lambda x: "/usr/bin/xclip" if x == "xclip" else None
-        mock_run.return_value.returncode = 0
+    def test_xclip_jpeg(self, clip):
+        clip.which.side_effect = lambda x: "/usr/bin/xclip" if x == "xclip" else None
 
         copy_image_to_clipboard("/tmp/img.jpg", "jpeg")
 
-        cmd = mock_run.call_args[0][0]
+        cmd = clip.run.call_args[0][0]
         assert "image/jpeg" in cmd
 
-    @patch(
-        "agentdeck.sessions.clipboard.open",
-        create=True,
-    )
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.shutil.which")
-    @patch("agentdeck.sessions.clipboard.subprocess.run")
-    def test_wl_copy_fallback(self, mock_run, mock_which, mock_sys, mock_open):
-        mock_sys.platform = "linux"
-        mock_which.side_effect = lambda x: "/usr/bin/wl-copy" if x == "wl-copy" else None
-        mock_run.return_value.returncode = 0
+    def test_wl_copy_fallback(self, clip, monkeypatch):
+        monkeypatch.setattr("agentdeck.sessions.clipboard.open", mock_open(), raising=False)
+        clip.which.side_effect = lambda x: "/usr/bin/wl-copy" if x == "wl-copy" else None
 
         copy_image_to_clipboard("/tmp/img.png", "png")
 
-        cmd = mock_run.call_args[0][0]
+        cmd = clip.run.call_args[0][0]
         assert "wl-copy" in cmd
         assert "image/png" in cmd
 
-    @patch("agentdeck.sessions.clipboard.sys")
-    @patch("agentdeck.sessions.clipboard.shutil.which")
-    def test_no_tool_raises(self, mock_which, mock_sys):
-        mock_sys.platform = "linux"
-        mock_which.return_value = None
+    def test_no_tool_raises(self, clip):
+        clip.which.return_value = None
 
         with pytest.raises(RuntimeError, match="No clipboard tool"):
             copy_image_to_clipboard("/tmp/img.png", "png")
@@ -52,3 +52,29 @@ def test_config_json_overrides_env_vars(tmp_path: Path, monkeypatch) -> None:
 
     # In simplified version, config.json overrides env (not ideal but simpler)
     assert settings.tmux_pane_width == 111
+
+
+def test_config_json_reread_after_edit(tmp_path: Path) -> None:
+    """An unchanged config.json is served from cache; edits are picked up."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"tmux_pane_width": 111}))
+    base = Settings(state_dir=str(tmp_path))
+
+    assert _load_config_file(base).tmux_pane_width == 111
+    assert _load_config_file(base).tmux_pane_width == 111
+
+    config_path.write_text(json.dumps({"tmux_pane_width": 2222}))
+
+    assert _load_config_file(base).tmux_pane_width == 2222
+
+
+def test_config_json_cache_not_shared_between_settings(tmp_path: Path) -> None:
+    """Mutating one loaded Settings does not leak into the next load."""
+    (tmp_path / "config.json").write_text(
+        json.dumps({"rehydrate_dir_whitelist": ["/tmp/a"]})
+    )
+    base = Settings(state_dir=str(tmp_path))
+
+    _load_config_file(base).rehydrate_dir_whitelist.append("/tmp/b")
+
+    assert _load_config_file(base).rehydrate_dir_whitelist == ["/tmp/a"]
@@ -1,6 +1,10 @@
+import logging
 from pathlib import Path
 
+import structlog
+
 from agentdeck.main import (
+    _configure_logging,
     _is_whitelisted_session_dir,
     _normalize_whitelist_dirs,
 )
@@ -39,3 +43,23 @@ def test_whitelist_blocks_missing_working_dir_when_enabled(tmp_path: Path) -> No
     whitelist = _normalize_whitelist_dirs([str(allowed)])
 
     assert _is_whitelisted_session_dir(None, whitelist) is False
+
+
+def test_whitelist_blocks_sibling_with_shared_prefix(tmp_path: Path) -> None:
+    allowed = tmp_path / "allowed"
+    sibling = tmp_path / "allowed-other"
+    allowed.mkdir()
+    sibling.mkdir()
+
+    whitelist = _normalize_whitelist_dirs([str(allowed)])
+
+    assert _is_whitelisted_session_dir(str(sibling), whitelist) is False
+
+
+def test_unknown_log_level_falls_back_to_info() -> None:
+    try:
+        _configure_logging("verbose")
+        wrapper = structlog.get_config()["wrapper_class"]
+        assert wrapper is structlog.make_filtering_bound_logger(logging.INFO)
+    finally:
+        structlog.reset_defaults()
@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pywebpush import WebPushException
 
 from agentdeck.notifications.push import PushNotifier
 from agentdeck.notifications.store import (
@@ -98,8 +99,6 @@ class TestEndpointCleanup:
 
 
 def _make_webpush_exc(status_code):
-    from pywebpush import WebPushException
-
     resp = MagicMock()
     resp.status_code = status_code
     return WebPushException("gone", response=resp)
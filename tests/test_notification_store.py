@@ -38,6 +38,25 @@ class TestSubscribe:
         assert set(ids) == {"s1", "s2"}
 
 
+class TestBatch:
+    def test_batch_writes_once_on_exit(self, store, tmp_path):
+        path = tmp_path / "subs.json"
+        with store.batch():
+            store.subscribe("https://ep/1", "k", "a", "s1")
+            store.subscribe("https://ep/1", "k", "a", "s2")
+            assert not path.exists()
+        data = json.loads(path.read_text())
+        assert {d["session_id"] for d in data} == {"s1", "s2"}
+
+    def test_nested_batch_writes_on_outermost_exit(self, store, tmp_path):
+        path = tmp_path / "subs.json"
+        with store.batch():
+            with store.batch():
+                store.subscribe("https://ep/1", "k", "a", "s1")
+            assert not path.exists()
+        assert len(json.loads(path.read_text())) == 1
+
+
 class TestUnsubscribe:
     def test_unsubscribe_removes(self, store):
         store.subscribe("https://ep/1", "k", "a", "s1")
@@ -1,7 +1,8 @@
 """Tests for notification API endpoints."""
 
+import asyncio
+
 import pytest
-import pytest_asyncio
 
 from agentdeck.main import app
 from agentdeck.notifications.store import (
@@ -9,30 +10,21 @@ from agentdeck.notifications.store import (
 )
 
 
-@pytest_asyncio.fixture
-async def client(tmp_path):
-    """Client with real push store on app.state."""
-    import httpx
-
+@pytest.fixture()
+def client(client, tmp_path, monkeypatch):
+    """Shared client with a fresh push store on app.state."""
     store = PushSubscriptionStore(tmp_path / "subs.json")
-    app.state.push_store = store
-    app.state.vapid_public_key = "test-vapid-key-abc"
+    monkeypatch.setattr(app.state, "push_store", store, raising=False)
+    monkeypatch.setattr(app.state, "vapid_public_key", "test-vapid-key-abc", raising=False)
+    return client
 
-    async with httpx.AsyncClient(
-        transport=httpx.ASGITransport(app=app),
-        base_url="http://test",
-    ) as ac:
-        yield ac
 
-
-@pytest.mark.asyncio
 async def test_vapid_key(client):
     resp = await client.get("/api/v1/notifications/vapid-key")
     assert resp.status_code == 200
     assert resp.json()["public_key"] == "test-vapid-key-abc"
 
 
-@pytest.mark.asyncio
 async def test_subscribe_and_query(client):
     resp = await client.post(
         "/api/v1/notifications/subscribe",
@@ -53,7 +45,6 @@ async def test_subscribe_and_query(client):
     assert resp.json() == ["s1"]
 
 
-@pytest.mark.asyncio
 async def test_unsubscribe(client):
     await client.post(
         "/api/v1/notifications/subscribe",
@@ -80,18 +71,22 @@ async def test_unsubscribe(client):
     assert resp.json() == []
 
 
-@pytest.mark.asyncio
 async def test_multi_session_subscribe(client):
-    for sid in ["s1", "s2"]:
-        await client.post(
-            "/api/v1/notifications/subscribe",
-            json={
-                "endpoint": "https://ep/1",
-                "p256dh": "k",
-                "auth": "a",
-                "session_id": sid,
-            },
+    """Concurrent subscribes from one endpoint are all recorded."""
+    await asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/notifications/subscribe",
+                json={
+                    "endpoint": "https://ep/1",
+                    "p256dh": "k",
+                    "auth": "a",
+                    "session_id": sid,
+                },
+            )
+            for sid in ["s1", "s2"]
         )
+    )
     resp = await client.get(
         "/api/v1/notifications/subscriptions",
         params={"endpoint": "https://ep/1"},
@@ -1,6 +1,9 @@
 """Tests for SessionManager with mocked TmuxBackend."""
 
+import asyncio
+import uuid
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
@@ -17,13 +20,42 @@ def mock_tmux():
     tmux = MagicMock()
     tmux.create_session.return_value = "agent-test"
     tmux.is_alive.return_value = True
+    tmux.is_alive_many.side_effect = lambda names: {n: tmux.is_alive(n) for n in names}
     tmux.capture_pane.return_value = "$ hello"
     return tmux
 
 
 @pytest.fixture()
-def output_log(tmp_path):
-    log = AgentOutputLog(tmp_path / "test.db")
+def simple_tmux():
+    """Call-free tmux stub for tests that never inspect tmux calls."""
+    return SimpleNamespace(
+        create_session=lambda *a, **k: "agent-test",
+        is_alive=lambda *a: True,
+        is_alive_many=lambda names: dict.fromkeys(names, True),
+        is_process_dead=lambda *a: False,
+        capture_pane=lambda *a, **k: "$ hello",
+        capture_pane_tail=lambda *a, **k: "$ hello",
+        capture_scrollback=lambda *a, **k: [],
+        get_history_size=lambda *a: 0,
+        send_keys=lambda *a, **k: None,
+        kill_session=lambda *a: None,
+        prime_cache=lambda *a, **k: None,
+    )
+
+
+@pytest.fixture()
+def simple_manager(simple_tmux, tmp_path):
+    m = SessionManager(
+        tmux=simple_tmux,
+        recent_dirs_path=tmp_path / "recent_dirs.txt",
+    )
+    yield m
+    m.close()
+
+
+@pytest.fixture()
+def output_log():
+    log = AgentOutputLog(f"file:log-{uuid.uuid4().hex}?mode=memory&cache=shared")
     yield log
     log.close()
 
@@ -31,25 +63,28 @@ def output_log(tmp_path):
 @pytest.fixture()
 def manager(mock_tmux, tmp_path):
     recent_dirs_path = tmp_path / "recent_dirs.txt"
-    return SessionManager(
+    m = SessionManager(
         tmux=mock_tmux,
         recent_dirs_path=recent_dirs_path,
     )
+    yield m
+    m.close()
 
 
 @pytest.fixture()
 def manager_with_log(mock_tmux, tmp_path, output_log):
     recent_dirs_path = tmp_path / "recent_dirs.txt"
-    return SessionManager(
+    m = SessionManager(
         tmux=mock_tmux,
         recent_dirs_path=recent_dirs_path,
         output_log=output_log,
     )
+    yield m
+    m.close()
 
 
-@pytest.mark.asyncio
-async def test_create_session(manager, tmp_path):
-    info = await manager.create_session(
+async def test_create_session(simple_manager, tmp_path):
+    info = await simple_manager.create_session(
         working_dir=str(tmp_path),
         agent_type=AgentType.CLAUDE,
     )
@@ -58,25 +93,33 @@ async def test_create_session(manager, tmp_path):
     assert info.agent_type == AgentType.CLAUDE
 
 
-@pytest.mark.asyncio
-async def test_create_session_bad_dir(manager):
+async def test_create_session_bad_dir(simple_manager):
     with pytest.raises(ValueError, match="Directory not found"):
-        await manager.create_session(working_dir="/nonexistent/path")
+        await simple_manager.create_session(working_dir="/nonexistent/path")
 
 
-@pytest.mark.asyncio
-async def test_create_session_same_dir_suffix(manager, tmp_path):
-    first = await manager.create_session(str(tmp_path))
-    second = await manager.create_session(str(tmp_path))
+async def test_create_session_same_dir_suffix(simple_manager, tmp_path):
+    first = await simple_manager.create_session(str(tmp_path))
+    second = await simple_manager.create_session(str(tmp_path))
     assert first.session_id == f"agent-claude-{tmp_path.name[:20].lower()}"
     assert second.session_id == f"agent-claude-{tmp_path.name[:20].lower()}-2"
 
 
-@pytest.mark.asyncio
+async def test_create_session_reuses_base_id_after_removal(simple_manager, tmp_path):
+    """Removing the only session for a dir frees its unsuffixed id."""
+    first = await simple_manager.create_session(str(tmp_path))
+    await simple_manager.kill_session(first.session_id)
+    simple_manager.remove_dead_session(first.session_id)
+
+    again = await simple_manager.create_session(str(tmp_path))
+    assert again.session_id == first.session_id
+
+
 async def test_send_input_text(manager, mock_tmux, tmp_path):
     info = await manager.create_session(str(tmp_path))
+    baseline = len(mock_tmux.send_keys.call_args_list)
     await manager.send_input(info.session_id, "explain this")
-    calls = mock_tmux.send_keys.call_args_list
+    calls = mock_tmux.send_keys.call_args_list[baseline:]
     # Text sent without enter, then Enter sent separately
     text_call = calls[-2]
     assert text_call == (
@@ -90,14 +133,58 @@ async def test_send_input_text(manager, mock_tmux, tmp_path):
     )
 
 
-@pytest.mark.asyncio
+async def test_send_input_waits_for_echo_before_enter(manager, mock_tmux, tmp_path):
+    """Enter is held back while the pane still shows pre-echo text."""
+    info = await manager.create_session(str(tmp_path))
+    manager._SETTLE_POLL_S = 0.001
+    frames = ["$ ", "$ ", "$ ", "$ explain"]
+    events: list[tuple[str, str]] = []
+
+    def capture(_sid: str) -> str:
+        frame = frames.pop(0) if len(frames) > 1 else frames[0]
+        events.append(("capture", frame))
+        return frame
+
+    mock_tmux.capture_pane.side_effect = capture
+    mock_tmux.send_keys.side_effect = lambda _sid, keys, **_: events.append(("send", keys))
+    await manager.send_input(info.session_id, "explain this")
+
+    enter_at = events.index(("send", "Enter"))
+    assert ("capture", "$ explain") in events[:enter_at]
+
+
+async def test_await_pane_quiet_returns_once_pane_settles(manager, mock_tmux, tmp_path):
+    """Settle wait ends as soon as the pane reacts and stops changing."""
+    info = await manager.create_session(str(tmp_path))
+    mock_tmux.capture_pane.side_effect = ["$ ", "$ explain", "$ explain"]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    settled = await manager._await_pane_quiet(info.session_id, "$ ", timeout=5.0)
+    assert settled == "$ explain"
+    assert loop.time() - start < 1.0
+
+
+async def test_wait_until_ready_returns_on_first_frame(manager, mock_tmux, tmp_path):
+    info = await manager.create_session(str(tmp_path))
+    mock_tmux.capture_pane.side_effect = ["", "\n\n", "Welcome"]
+    ready = await manager.wait_until_ready(info.session_id, timeout=5.0, initial=0.01)
+    assert ready is True
+    assert mock_tmux.capture_pane.call_count == 3
+
+
+async def test_wait_until_ready_times_out(manager, mock_tmux, tmp_path):
+    info = await manager.create_session(str(tmp_path))
+    mock_tmux.capture_pane.return_value = ""
+    ready = await manager.wait_until_ready(info.session_id, timeout=0.05, initial=0.01)
+    assert ready is False
+
+
 async def test_send_input_shortcut(manager, mock_tmux, tmp_path):
     info = await manager.create_session(str(tmp_path))
     await manager.send_input(info.session_id, "stop")
     mock_tmux.send_keys.assert_called_with(info.session_id, "Escape", enter=False)
 
 
-@pytest.mark.asyncio
 async def test_capture_output(manager, mock_tmux, tmp_path):
     info = await manager.create_session(str(tmp_path))
     output = await manager.capture_output(info.session_id)
@@ -109,29 +196,62 @@ async def test_capture_output(manager, mock_tmux, tmp_path):
     assert output2.changed is False
 
 
-@pytest.mark.asyncio
-async def test_unknown_session_raises(manager):
+async def test_capture_output_concurrent_callers_share_capture(
+    manager, mock_tmux, tmp_path
+):
+    """Concurrent captures of one session hit tmux only once."""
+    info = await manager.create_session(str(tmp_path))
+    outputs = await asyncio.gather(
+        manager.capture_output(info.session_id),
+        manager.capture_output(info.session_id),
+        manager.capture_output(info.session_id),
+    )
+    assert mock_tmux.capture_pane.call_count == 1
+    assert all(o.content == "$ hello" for o in outputs)
+
+    # Once settled, the next call captures again
+    await manager.capture_output(info.session_id)
+    assert mock_tmux.capture_pane.call_count == 2
+
+
+async def test_list_tmux_session_paths(manager, mock_tmux):
+    mock_tmux.list_sessions.return_value = ["agent-a", "other"]
+    mock_tmux.get_session_path.side_effect = {"agent-a": "/w", "other": None}.get
+    assert await manager.list_tmux_session_paths() == {"agent-a": "/w", "other": None}
+
+
+async def test_unknown_session_raises(simple_manager):
     with pytest.raises(KeyError, match="Unknown"):
-        await manager.send_input("fake-id", "hello")
+        await simple_manager.send_input("fake-id", "hello")
 
 
-def test_record_recent_dir_persists_to_text_file(tmp_path, mock_tmux):
+def test_record_recent_dir_persists_to_text_file(manager, tmp_path):
     """Recent dirs are stored in a separate text file, not config.json."""
+    # Same path the manager fixture uses; it is read lazily
     recent_dirs_path = tmp_path / "recent_dirs.txt"
     recent_dirs_path.write_text("~/old\n")
-    mgr = SessionManager(
-        tmux=mock_tmux,
-        recent_dirs_path=recent_dirs_path,
-    )
 
     workdir = str(Path.home() / "repo")
-    mgr._record_recent_dir(workdir)
+    manager._record_recent_dir(workdir)
 
     lines = recent_dirs_path.read_text().splitlines()
     assert lines[0] == "~/repo"
     assert lines[1] == "~/old"
 
 
+def test_record_recent_dir_skips_write_when_unchanged(manager, tmp_path):
+    """Re-recording the newest dir leaves the file untouched."""
+    recent_dirs_path = tmp_path / "recent_dirs.txt"
+    manager._record_recent_dir("/srv/repo")
+    mtime = recent_dirs_path.stat().st_mtime_ns
+
+    manager._record_recent_dir("/srv/repo")
+
+    assert recent_dirs_path.stat().st_mtime_ns == mtime
+    assert manager.list_recent_dirs() == ["/srv/repo"]
+    assert not recent_dirs_path.with_suffix(".tmp").exists()
+
+
 SELECTION_OUTPUT = """\
   Which option?
   ❯ 1. Allow
@@ -141,22 +261,19 @@ SELECTION_OUTPUT = """\
 Enter to select · ↑/↓ to navigate · Esc to cancel"""
 
 
-@pytest.mark.asyncio
 async def test_send_selection_navigates_down(manager, mock_tmux, tmp_path):
     """Selecting item 2 when ❯ is on item 1 sends one Down + Enter."""
     mock_tmux.capture_pane.return_value = SELECTION_OUTPUT
     info = await manager.create_session(str(tmp_path))
+    baseline = len(mock_tmux.send_keys.call_args_list)
     await manager.send_selection(info.session_id, 2)
 
-    calls = mock_tmux.send_keys.call_args_list
-    # Filter to calls after create_session
-    arrow_calls = [c for c in calls if c[0][1] == "Down"]
-    enter_calls = [c for c in calls if c[0][1] == "Enter"]
-    assert len(arrow_calls) == 1
-    assert len(enter_calls) == 1
+    # Only calls made by send_selection
+    calls = mock_tmux.send_keys.call_args_list[baseline:]
+    assert sum(1 for c in calls if c[0][1] == "Down") == 1
+    assert sum(1 for c in calls if c[0][1] == "Enter") == 1
 
 
-@pytest.mark.asyncio
 async def test_send_selection_navigates_up(manager, mock_tmux, tmp_path):
     """Selecting item 1 when ❯ is on item 2 sends one Up + Enter."""
     output_cursor_on_2 = """\
@@ -168,16 +285,14 @@ async def test_send_selection_navigates_up(manager, mock_tmux, tmp_path):
 Enter to select · ↑/↓ to navigate · Esc to cancel"""
     mock_tmux.capture_pane.return_value = output_cursor_on_2
     info = await manager.create_session(str(tmp_path))
+    baseline = len(mock_tmux.send_keys.call_args_list)
     await manager.send_selection(info.session_id, 1)
 
-    calls = mock_tmux.send_keys.call_args_list
-    up_calls = [c for c in calls if c[0][1] == "Up"]
-    enter_calls = [c for c in calls if c[0][1] == "Enter"]
-    assert len(up_calls) == 1
-    assert len(enter_calls) == 1
+    calls = mock_tmux.send_keys.call_args_list[baseline:]
+    assert sum(1 for c in calls if c[0][1] == "Up") == 1
+    assert sum(1 for c in calls if c[0][1] == "Enter") == 1
 
 
-@pytest.mark.asyncio
 async def test_send_selection_unknown_item(manager, mock_tmux, tmp_path):
     """Selecting a non-existent item raises ValueError."""
     mock_tmux.capture_pane.return_value = SELECTION_OUTPUT
@@ -186,21 +301,20 @@ async def test_send_selection_unknown_item(manager, mock_tmux, tmp_path):
         await manager.send_selection(info.session_id, 99)
 
 
-@pytest.mark.asyncio
 async def test_send_selection_freeform(manager, mock_tmux, tmp_path):
     """Freeform selection sends Enter then text + Enter."""
     mock_tmux.capture_pane.return_value = SELECTION_OUTPUT
     info = await manager.create_session(str(tmp_path))
+    baseline = len(mock_tmux.send_keys.call_args_list)
     await manager.send_selection(info.session_id, 3, freeform_text="custom answer")
 
-    calls = mock_tmux.send_keys.call_args_list
+    calls = mock_tmux.send_keys.call_args_list[baseline:]
     # Should have arrow keys (2 Downs), Enter, then literal text
     text_calls = [c for c in calls if len(c[0]) >= 2 and c[0][1] == "custom answer"]
     assert len(text_calls) == 1
     assert text_calls[0][1]["literal"] is True
 
 
-@pytest.mark.asyncio
 async def test_capture_to_log_appends_delta(
     manager_with_log, mock_tmux, output_log, tmp_path
 ):
@@ -235,7 +349,27 @@ async def test_capture_to_log_appends_delta(
     assert page.chunks[1].content == "line3\nline4"
 
 
-@pytest.mark.asyncio
+async def test_capture_to_log_delta_after_scrolled_overlap(
+    manager_with_log, mock_tmux, output_log, tmp_path
+):
+    """A full 5-line fingerprint locates the overlap after old lines scroll off."""
+    mock_tmux.is_process_dead.return_value = False
+    first = [f"line{i}" for i in range(6)]
+    mock_tmux.get_history_size.return_value = len(first)
+    mock_tmux.capture_scrollback.return_value = [*first, "visible"]
+    info = await manager_with_log.create_session(str(tmp_path))
+    await manager_with_log.capture_to_log(info.session_id)
+
+    # Oldest lines dropped out of history, two new ones arrived
+    second = [f"line{i}" for i in range(1, 8)]
+    mock_tmux.get_history_size.return_value = len(second)
+    mock_tmux.capture_scrollback.return_value = [*second, "visible"]
+    await manager_with_log.capture_to_log(info.session_id)
+
+    page = output_log.read(info.session_id)
+    assert page.chunks[-1].content == "line6\nline7"
+
+
 async def test_capture_skips_when_history_size_unchanged(
     manager_with_log, mock_tmux, output_log, tmp_path
 ):
@@ -263,7 +397,6 @@ async def test_capture_skips_when_history_size_unchanged(
     assert len(page.chunks) == 1
 
 
-@pytest.mark.asyncio
 async def test_capture_final_on_death(manager_with_log, mock_tmux, output_log, tmp_path):
     """Process death triggers full capture + cleanup."""
     mock_tmux.is_process_dead.return_value = False
@@ -299,7 +432,6 @@ async def test_capture_final_on_death(manager_with_log, mock_tmux, output_log, t
     assert dead[0].is_alive is False
 
 
-@pytest.mark.asyncio
 async def test_capture_to_log_skipped_without_log(manager, mock_tmux, tmp_path):
     """No-op when AgentOutputLog is not configured."""
     mock_tmux.capture_scrollback.return_value = ["line1"]
@@ -311,39 +443,35 @@ async def test_capture_to_log_skipped_without_log(manager, mock_tmux, tmp_path):
 # --- Dead session tests ---
 
 
-@pytest.mark.asyncio
-async def test_kill_marks_dead(manager, mock_tmux, tmp_path):
+async def test_kill_marks_dead(simple_manager, tmp_path):
     """Kill marks session dead with ended_at."""
-    info = await manager.create_session(str(tmp_path))
-    await manager.kill_session(info.session_id)
+    info = await simple_manager.create_session(str(tmp_path))
+    await simple_manager.kill_session(info.session_id)
 
-    sessions = await manager.list_sessions()
+    sessions = await simple_manager.list_sessions()
     dead = [s for s in sessions if s.session_id == info.session_id]
     assert len(dead) == 1
     assert dead[0].is_alive is False
     assert dead[0].ended_at is not None
 
 
-@pytest.mark.asyncio
-async def test_active_ids_excludes_dead(manager, mock_tmux, tmp_path):
+async def test_active_ids_excludes_dead(simple_manager, tmp_path):
     """Capture loop skips dead sessions."""
-    info = await manager.create_session(str(tmp_path))
-    await manager.kill_session(info.session_id)
+    info = await simple_manager.create_session(str(tmp_path))
+    await simple_manager.kill_session(info.session_id)
 
-    assert info.session_id not in manager.active_session_ids()
+    assert info.session_id not in simple_manager.active_session_ids()
 
 
-@pytest.mark.asyncio
-async def test_send_input_dead_raises(manager, mock_tmux, tmp_path):
+async def test_send_input_dead_raises(simple_manager, tmp_path):
     """Sending input to a dead session raises ValueError."""
-    info = await manager.create_session(str(tmp_path))
-    await manager.kill_session(info.session_id)
+    info = await simple_manager.create_session(str(tmp_path))
+    await simple_manager.kill_session(info.session_id)
 
     with pytest.raises(ValueError, match="Session ended"):
-        await manager.send_input(info.session_id, "hello")
+        await simple_manager.send_input(info.session_id, "hello")
 
 
-@pytest.mark.asyncio
 async def test_list_detects_tmux_death(manager, mock_tmux, tmp_path):
     """list_sessions auto-marks sessions dead when tmux dies."""
     info = await manager.create_session(str(tmp_path))
@@ -1,7 +1,8 @@
 """Tests for the sessions REST API."""
 
 import io
-import time
+import itertools
+import uuid
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -33,21 +34,45 @@ def _make_mock_manager():
     return mgr
 
 
+@pytest.fixture(scope="module")
+def _mock_manager():
+    """Mock manager built once, with its baseline method mocks."""
+    mgr = _make_mock_manager()
+    baseline = {
+        name: value
+        for name, value in vars(mgr).items()
+        if isinstance(value, (AsyncMock, MagicMock))
+    }
+    return mgr, baseline
+
+
 @pytest.fixture(autouse=True)
-def _setup_mock_manager():
-    app.state.session_manager = _make_mock_manager()
+def _setup_mock_manager(_mock_manager, monkeypatch):
+    """Reset the shared mock manager and install it on app.state.
+
+    Methods a test rebinds are restored to their baseline mocks,
+    and recorded calls are cleared.
+    """
+    mgr, baseline = _mock_manager
+    mgr.reset_mock()
+    for name, method in baseline.items():
+        method.reset_mock()
+        setattr(mgr, name, method)
+    monkeypatch.setattr(app.state, "session_manager", mgr, raising=False)
 
 
 @pytest.fixture()
-def output_log(tmp_path):
-    log = AgentOutputLog(tmp_path / "test.db")
-    app.state.output_log = log
+def output_log(monkeypatch):
+    ticks = itertools.count(1)
+    log = AgentOutputLog(
+        f"file:log-{uuid.uuid4().hex}?mode=memory&cache=shared",
+        clock=lambda: 1e9 + next(ticks) * 1e-3,
+    )
+    monkeypatch.setattr(app.state, "output_log", log, raising=False)
     yield log
     log.close()
-    app.state.output_log = None
 
 
-@pytest.mark.asyncio
 async def test_create_session(client):
     resp = await client.post(
         "/api/v1/sessions",
@@ -58,7 +83,6 @@ async def test_create_session(client):
     assert data["session_id"] == "agent-test123"
 
 
-@pytest.mark.asyncio
 async def test_get_session_not_found(client):
     app.state.session_manager.get_session = AsyncMock(
         side_effect=KeyError("Unknown session")
@@ -67,7 +91,6 @@ async def test_get_session_not_found(client):
     assert resp.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_send_selection_not_found(client):
     app.state.session_manager.send_selection = AsyncMock(
         side_effect=KeyError("Unknown session")
@@ -79,7 +102,6 @@ async def test_send_selection_not_found(client):
     assert resp.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_send_selection_bad_item(client):
     app.state.session_manager.send_selection = AsyncMock(
         side_effect=ValueError("Item 99 not found")
@@ -91,11 +113,9 @@ async def test_send_selection_bad_item(client):
     assert resp.status_code == 400
 
 
-@pytest.mark.asyncio
 async def test_history_returns_chunks(client, output_log):
     """History mode returns seeded chunks from real SQLite."""
     output_log.append("agent-test123", ["hello world"])
-    time.sleep(0.01)
     output_log.append("agent-test123", ["second chunk"])
 
     resp = await client.get(
@@ -110,11 +130,9 @@ async def test_history_returns_chunks(client, output_log):
     assert data["earliest_ts"] is not None
 
 
-@pytest.mark.asyncio
 async def test_history_pagination(client, output_log):
     """Passing before= returns only older chunks."""
     output_log.append("s1", ["old line"])
-    time.sleep(0.01)
     output_log.append("s1", ["new line"])
     new_ts = output_log.latest_ts("s1")
 
@@ -128,7 +146,6 @@ async def test_history_pagination(client, output_log):
     assert data["chunks"][0]["content"] == "old line"
 
 
-@pytest.mark.asyncio
 async def test_history_empty_session(client, output_log):
     """History for unknown session returns empty list."""
     resp = await client.get(
@@ -140,11 +157,9 @@ async def test_history_empty_session(client, output_log):
     assert data["earliest_ts"] is None
 
 
-@pytest.mark.asyncio
 async def test_history_respects_limit(client, output_log):
     """Limit caps the number of returned chunks."""
-    for i in range(10):
-        output_log.append("s1", [f"line{i}"])
+    output_log.append_many("s1", ([f"line{i}"] for i in range(10)))
     resp = await client.get(
         "/api/v1/sessions/s1/output",
         params={"mode": "history", "limit": 3},
@@ -159,7 +174,6 @@ async def test_history_respects_limit(client, output_log):
 # --- Dead session tests ---
 
 
-@pytest.mark.asyncio
 async def test_live_output_dead_session(client):
     """Live output for dead session returns 'Session ended'."""
     dead_info = SessionInfo(
@@ -177,7 +191,6 @@ async def test_live_output_dead_session(client):
     assert "Session ended" in resp.text
 
 
-@pytest.mark.asyncio
 async def test_send_input_dead_returns_409(client):
     """Sending input to a dead session returns 409."""
     mgr = app.state.session_manager
@@ -194,7 +207,6 @@ async def test_send_input_dead_returns_409(client):
 _PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
 
 
-@pytest.mark.asyncio
 async def test_paste_image_png(client):
     """Upload a PNG image and paste it into the session."""
     resp = await client.post(
@@ -210,7 +222,6 @@ async def test_paste_image_png(client):
     assert call_args[0][2] == "png"
 
 
-@pytest.mark.asyncio
 async def test_paste_image_jpeg(client):
     """Upload a JPEG image."""
     resp = await client.post(
@@ -222,7 +233,6 @@ async def test_paste_image_jpeg(client):
     assert call_args[0][2] == "jpeg"
 
 
-@pytest.mark.asyncio
 async def test_paste_image_bad_type(client):
     """Non-image content type is rejected."""
     resp = await client.post(
@@ -233,7 +243,6 @@ async def test_paste_image_bad_type(client):
     assert "Unsupported" in resp.json()["detail"]
 
 
-@pytest.mark.asyncio
 async def test_paste_image_dead_session(client):
     """Pasting to a dead session returns 409."""
     mgr = app.state.session_manager
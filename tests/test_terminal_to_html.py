@@ -1,7 +1,18 @@
 """Tests for _terminal_to_html box-drawing conversion."""
 
+import functools
+
+import pytest
+
 from agentdeck.api.sessions import _terminal_to_html
 
+
+@functools.cache
+def _render(raw: str) -> str:
+    """Render once per distinct input; the fixtures are shared by many tests."""
+    return str(_terminal_to_html(raw))
+
+
 # ── Multi-column table ──────────────────────────────────────
 
 
@@ -15,13 +26,13 @@ TABLE_INPUT = """\
 
 
 def test_table_produces_html_table():
-    result = str(_terminal_to_html(TABLE_INPUT))
+    result = _render(TABLE_INPUT)
     assert "<table" in result
     assert "terminal-table" in result
 
 
 def test_table_has_header_row():
-    result = str(_terminal_to_html(TABLE_INPUT))
+    result = _render(TABLE_INPUT)
     assert "<thead>" in result
     assert "<th>#</th>" in result
     assert "<th>Test</th>" in result
@@ -29,7 +40,7 @@ def test_table_has_header_row():
 
 
 def test_table_has_body_rows():
-    result = str(_terminal_to_html(TABLE_INPUT))
+    result = _render(TABLE_INPUT)
     assert "<tbody>" in result
     assert "foo_<wbr>test" in result
     assert "bar_<wbr>test" in result
@@ -46,13 +57,13 @@ def test_table_cells_have_wbr_after_underscores():
         "│ 1 │ long_snake_case_name │\n"
         "└───┴──────────────────────┘"
     )
-    result = str(_terminal_to_html(inp))
+    result = _render(inp)
     assert "long_<wbr>snake_<wbr>case_<wbr>name" in result
 
 
 def test_table_strips_box_drawing():
     """No box-drawing characters should remain."""
-    result = str(_terminal_to_html(TABLE_INPUT))
+    result = _render(TABLE_INPUT)
     for ch in "┌┬┐├┼┤└┴┘─":
         assert ch not in result
 
@@ -69,19 +80,19 @@ PANEL_INPUT = """\
 
 
 def test_panel_produces_div():
-    result = str(_terminal_to_html(PANEL_INPUT))
+    result = _render(PANEL_INPUT)
     assert '<div class="terminal-panel">' in result
 
 
 def test_panel_contains_content():
-    result = str(_terminal_to_html(PANEL_INPUT))
+    result = _render(PANEL_INPUT)
     assert "Plan to implement" in result
     assert "step 1: read code" in result
     assert "step 2: write tests" in result
 
 
 def test_panel_strips_box_drawing():
-    result = str(_terminal_to_html(PANEL_INPUT))
+    result = _render(PANEL_INPUT)
     for ch in "╭╮╰╯│─":
         assert ch not in result
 
@@ -97,7 +108,7 @@ SQUARE_PANEL = """\
 
 def test_square_panel_produces_div():
     """Square-corner panels (no ┬) are panels, not tables."""
-    result = str(_terminal_to_html(SQUARE_PANEL))
+    result = _render(SQUARE_PANEL)
     assert '<div class="terminal-panel">' in result
     assert "Warning message" in result
     assert "<table" not in result
@@ -119,24 +130,24 @@ PANEL_WITH_TABLE = """\
 
 
 def test_panel_with_table_renders_both():
-    result = str(_terminal_to_html(PANEL_WITH_TABLE))
+    result = _render(PANEL_WITH_TABLE)
     assert '<div class="terminal-panel">' in result
     assert '<table class="terminal-table">' in result
 
 
 def test_panel_with_table_has_label():
-    result = str(_terminal_to_html(PANEL_WITH_TABLE))
+    result = _render(PANEL_WITH_TABLE)
     assert "Template changes needed" in result
 
 
 def test_panel_with_table_has_cells():
-    result = str(_terminal_to_html(PANEL_WITH_TABLE))
+    result = _render(PANEL_WITH_TABLE)
     assert "<th>What</th>" in result
     assert "<td>fieldset</td>" in result
 
 
 def test_panel_with_table_strips_box_drawing():
-    result = str(_terminal_to_html(PANEL_WITH_TABLE))
+    result = _render(PANEL_WITH_TABLE)
     for ch in "╭╮╰╯┌┬┐├┼┤└┴┘─│":
         assert ch not in result
 
@@ -160,29 +171,25 @@ Final line"""
 
 
 def test_mixed_preserves_plain_text():
-    result = str(_terminal_to_html(MIXED))
+    result = _render(MIXED)
     assert "Some plain text above" in result
     assert "More text below" in result
     assert "Final line" in result
 
 
 def test_mixed_converts_hrule():
-    result = str(_terminal_to_html(MIXED))
+    result = _render(MIXED)
     assert '<hr class="terminal-hr">' in result
 
 
-def test_dashed_hrule_variants():
+@pytest.mark.parametrize("ch", list("─╌╍┄┅┈┉━"), ids=lambda ch: f"U+{ord(ch):04X}")
+def test_dashed_hrule_variants(ch):
     """All box-drawing dash chars become <hr>."""
-    for ch in "─╌╍┄┅┈┉━":
-        line = ch * 20
-        result = str(_terminal_to_html(line))
-        assert '<hr class="terminal-hr">' in result, (
-            f"U+{ord(ch):04X} ({ch}) not recognized as hrule"
-        )
+    assert '<hr class="terminal-hr">' in _render(ch * 20)
 
 
 def test_mixed_converts_panel_and_table():
-    result = str(_terminal_to_html(MIXED))
+    result = _render(MIXED)
     assert '<div class="terminal-panel">' in result
     assert '<table class="terminal-table">' in result
 
@@ -203,19 +210,19 @@ HEADLESS_PANEL = """\
 
 def test_headless_panel_produces_div():
     """Panel without top border is still rendered as a panel."""
-    result = str(_terminal_to_html(HEADLESS_PANEL))
+    result = _render(HEADLESS_PANEL)
     assert '<div class="terminal-panel">' in result
 
 
 def test_headless_panel_contains_content():
-    result = str(_terminal_to_html(HEADLESS_PANEL))
+    result = _render(HEADLESS_PANEL)
     assert "Verification" in result
     assert "Check SVG icons" in result
     assert "Test popover" in result
 
 
 def test_headless_panel_strips_box_drawing():
-    result = str(_terminal_to_html(HEADLESS_PANEL))
+    result = _render(HEADLESS_PANEL)
     for ch in "╰╯│─":
         assert ch not in result
 
@@ -234,7 +241,7 @@ ASCII_TABLE = """\
 
 def test_ascii_table_converted_to_html():
     """ASCII +/-/| tables (e.g. tabulate grid) render like Unicode ones."""
-    result = str(_terminal_to_html(ASCII_TABLE))
+    result = _render(ASCII_TABLE)
     assert '<table class="terminal-table">' in result
     assert "<th>Filing</th>" in result
     assert "<td>8.3%</td>" in result
@@ -253,7 +260,7 @@ HEADLESS_TABLE_CHUNK = """\
 
 def test_headless_table_renders_as_table():
     """Table rows without top border (split across chunks)."""
-    result = str(_terminal_to_html(HEADLESS_TABLE_CHUNK))
+    result = _render(HEADLESS_TABLE_CHUNK)
     assert '<table class="terminal-table">' in result
     assert "<td>0000928816-17-002437</td>" in result
     assert "<thead>" not in result  # no fake header
@@ -263,11 +270,28 @@ def test_headless_table_renders_as_table():
 
 
 def test_plain_text_is_escaped():
-    result = str(_terminal_to_html("<script>alert(1)</script>"))
+    result = _render("<script>alert(1)</script>")
     assert "<script>" not in result
     assert "&lt;script&gt;" in result
 
 
 def test_plain_text_no_conversion():
-    result = str(_terminal_to_html("just normal text\nline two"))
+    result = _render("just normal text\nline two")
     assert result == "just normal text\nline two"
+
+
+# ── Status bar spacing ───────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "> prompt" + " " * 40 + "? for shortcuts",
+        "────────\n> prompt" + " " * 40 + "82% context left",
+    ],
+    ids=["plain", "with-hrule"],
+)
+def test_status_bar_spacing_collapsed(raw):
+    last = _render(raw).split("\n")[-1]
+    assert last.startswith("&gt; prompt  ")
+    assert "   " not in last
@@ -1,44 +1,105 @@
-"""Integration tests for TmuxBackend against real tmux."""
+"""Integration tests for TmuxBackend against real tmux.
 
+Mostly waiting on tmux, so they parallelize well:
+uv run pytest -n auto tests/test_tmux_backend.py
+"""
+
+import os
+import shutil
 import time
+import uuid
+from collections.abc import Callable
 
 import pytest
 
 from agentdeck.sessions.tmux_backend import TmuxBackend
+from agentdeck.sessions.ui_state_detector import SELECTION_WINDOW_LINES
 
-SESSION_PREFIX = "test-mcs-"
+pytestmark = pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
 
+# Tagged with the xdist worker id so each worker only sweeps its
+# own sessions.
+SESSION_PREFIX = f"test-mcs-{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}-"
 
-@pytest.fixture()
+
+def wait_until[T](fn: Callable[[], T], timeout: float = 1.0, interval: float = 0.02) -> T:
+    """Poll fn until it returns a truthy value or timeout passes.
+
+    Replaces fixed sleeps after send_keys: returns as soon as tmux
+    catches up, and returns the last result on timeout so the
+    caller's assertion reports the failure.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = fn()
+        if value:
+            return value
+        time.sleep(interval)
+    return fn()
+
+
+@pytest.fixture(scope="module")
 def backend():
-    """Real TmuxBackend with cleanup of all test sessions."""
+    """Real TmuxBackend shared by the module.
+
+    Sessions are killed per test by make_session; this sweep only
+    catches anything a failed test left behind.
+    """
     b = TmuxBackend(pane_width=80, pane_height=24)
     yield b
-    # Kill any test sessions left behind
-    for name in b.list_sessions():
-        if name.startswith(SESSION_PREFIX):
-            b.kill_session(name)
+    leftover = [n for n in b.list_sessions() if n.startswith(SESSION_PREFIX)]
+    if leftover:
+        # One tmux invocation: kill-session -t =a ; kill-session -t =b ...
+        args: list[str] = []
+        for name in leftover:
+            args += [";", "kill-session", "-t", f"={name}"]
+        b.server.cmd(*args[1:])
+        b.invalidate()
+
+
+@pytest.fixture()
+def make_session(backend):
+    """Factory for uniquely named test sessions; kills them afterwards."""
+    created: list[str] = []
+
+    def make(command: str = "bash", label: str = "s") -> str:
+        name = f"{SESSION_PREFIX}{label}-{uuid.uuid4().hex[:8]}"
+        backend.create_session(name, command)
+        created.append(name)
+        return name
+
+    yield make
+    # kill_session is a no-op for sessions already gone
+    for name in created:
+        backend.kill_session(name)
+
+
+@pytest.fixture(scope="module")
+def missing_name(backend):
+    """A session name checked absent once and shared by negative tests."""
+    name = f"{SESSION_PREFIX}missing-{uuid.uuid4().hex[:8]}"
+    assert name not in backend.list_sessions()
+    return name
 
 
 @pytest.fixture()
-def session(backend):
+def session(backend, make_session):
     """Create a bash session and return its name."""
-    name = f"{SESSION_PREFIX}{int(time.time())}"
-    backend.create_session(name, "bash")
-    time.sleep(0.3)  # let bash start
+    name = make_session()
+    wait_until(lambda: backend.capture_pane(name).strip())  # let bash start
     return name
 
 
-def test_create_and_list(backend):
-    name = f"{SESSION_PREFIX}create"
-    backend.create_session(name, "bash")
+def test_create_and_list(backend, make_session):
+    name = make_session(label="create")
     assert name in backend.list_sessions()
 
 
 def test_send_keys_and_capture(backend, session):
     """Send a command and verify it appears in captured output."""
     backend.send_keys(session, "echo HELLO_TMUX", enter=True)
-    time.sleep(0.3)
+    # Wait for the echoed output line, not just the typed command
+    wait_until(lambda: "\nHELLO_TMUX" in backend.capture_pane(session))
     output = backend.capture_pane(session)
     assert "HELLO_TMUX" in output
 
@@ -49,20 +110,78 @@ def test_kill_session(backend, session):
     assert backend.is_alive(session) is False
 
 
-def test_kill_missing_session_is_silent(backend):
+def test_is_alive_many(backend, session):
+    result = backend.is_alive_many([session, f"{SESSION_PREFIX}missing"])
+    assert result == {session: True, f"{SESSION_PREFIX}missing": False}
+
+
+def test_get_session_path(backend, make_session, tmp_path):
+    name = make_session(f"cd {tmp_path} && exec bash", label="path")
+
+    def current_path() -> str | None:
+        backend.invalidate()
+        return backend.get_session_path(name)
+
+    assert wait_until(lambda: current_path() == str(tmp_path))
+
+
+def test_prime_cache_sees_external_kill(backend, session):
+    """Cached lookups pick up out-of-band changes after a prime."""
+    assert backend.is_alive(session) is True
+    TmuxBackend().kill_session(session)
+    backend.prime_cache()
+    assert backend.is_alive(session) is False
+
+
+def test_pane_gone_after_cache_fill_raises_value_error(backend, session, make_session):
+    """A pane killed behind the cache's back reads as a missing session."""
+    make_session(label="keep")  # keep the server up
+    backend.capture_pane(session)  # fill the cache
+    backend.server.cmd("kill-session", "-t", f"={session}")
+    with pytest.raises(ValueError, match="No active pane"):
+        backend.capture_pane(session)
+
+
+def test_other_tmux_errors_keep_their_message(backend, session):
+    """Errors other than a missing target surface tmux's stderr."""
+    with pytest.raises(RuntimeError, match="unknown flag"):
+        backend._pane_cmd(session, "capture-pane", "-Q")
+    assert backend.is_alive(session) is True
+
+
+def test_pane_height_capped_to_parser_window():
+    """A pane taller than the parser's window is created at the cap."""
+    tall = TmuxBackend(pane_height=SELECTION_WINDOW_LINES * 3)
+    name = f"{SESSION_PREFIX}tall-{uuid.uuid4().hex[:8]}"
+    tall.create_session(name, "sleep 30")
+    try:
+        result = tall.server.cmd(
+            "display-message", "-p", "-t", f"={name}:", "#{pane_height}"
+        )
+        assert int(result.stdout[0]) == SELECTION_WINDOW_LINES
+    finally:
+        tall.kill_session(name)
+
+
+def test_kill_missing_session_is_silent(backend, missing_name):
     """Killing a non-existent session should not raise."""
-    backend.kill_session(f"{SESSION_PREFIX}nonexistent")
+    backend.kill_session(missing_name)
 
 
-def test_send_keys_missing_session_raises(backend):
+def test_send_keys_missing_session_raises(backend, missing_name):
     with pytest.raises(ValueError, match="Session not found"):
-        backend.send_keys(f"{SESSION_PREFIX}missing", "hello")
+        backend.send_keys(missing_name, "hello")
 
 
 def test_capture_scrollback(backend, session):
     """Scrollback captures full history, not just visible pane."""
     backend.send_keys(session, "echo SCROLLBACK_TEST", enter=True)
-    time.sleep(0.3)
+    wait_until(
+        lambda: any(
+            line.startswith("SCROLLBACK_TEST")
+            for line in backend.capture_scrollback(session)
+        )
+    )
     lines = backend.capture_scrollback(session)
     assert isinstance(lines, list)
     assert any("SCROLLBACK_TEST" in line for line in lines)
@@ -72,9 +191,8 @@ def test_get_history_size(backend, session):
     """history_size grows as output scrolls above the pane."""
     initial = backend.get_history_size(session)
     # Generate enough output to push lines into scrollback
-    for i in range(30):
-        backend.send_keys(session, f"echo line{i}", enter=True)
-    time.sleep(0.5)
+    backend.send_keys(session, "for i in $(seq 1 30); do echo line$i; done", enter=True)
+    wait_until(lambda: backend.get_history_size(session) > initial)
     after = backend.get_history_size(session)
     assert after > initial
 
@@ -89,14 +207,30 @@ def test_is_process_dead_alive(backend, session):
     assert backend.is_process_dead(session) is False
 
 
-def test_is_process_dead_after_exit(backend):
+def test_is_process_dead_after_exit(backend, make_session):
     """Exited process is detected as dead (remain-on-exit)."""
-    name = f"{SESSION_PREFIX}die-{int(time.time())}"
-    backend.create_session(name, "sleep 0.2")
-    time.sleep(1)  # wait for sleep to finish
-    assert backend.is_process_dead(name) is True
+    name = make_session("sleep 0.1", label="die")
+    assert wait_until(lambda: backend.is_process_dead(name)) is True
 
 
 def test_is_process_dead_missing_session(backend):
     """Missing session returns False."""
     assert backend.is_process_dead(f"{SESSION_PREFIX}gone") is False
+
+
+def test_backends_share_pooled_server():
+    """Backends on the same socket reuse one libtmux Server."""
+    a = TmuxBackend()
+    b = TmuxBackend(pane_width=80, pane_height=24)
+    assert a.server is b.server
+    assert TmuxBackend(socket_name="test-mcs-pool").server is not a.server
+
+
+def test_capture_pane_tail(backend, session):
+    """Tail capture returns only the bottom lines of the pane."""
+    backend.send_keys(session, "printf 'A\\nB\\nTAIL_END\\n'", enter=True)
+    wait_until(lambda: "TAIL_END" in backend.capture_pane(session).split("\n"))
+    full = backend.capture_pane(session).split("\n")
+    tail = backend.capture_pane_tail(session, 3)
+    assert tail.split("\n") == full[-3:]
+    assert "TAIL_END" in tail
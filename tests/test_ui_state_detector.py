@@ -8,11 +8,18 @@ from agentdeck.sessions.ui_state_detector import UIStateDetector
 FOOTER = "\nEnter to select · ↑/↓ to navigate · Esc to cancel"
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def parser():
+    # Stateless: parse() is a module-level function behind a shim
     return UIStateDetector()
 
 
+@pytest.fixture(scope="module")
+def real_capture(parser):
+    """SELECTION_REAL_CAPTURE parsed once; several tests inspect it."""
+    return parser.parse(SELECTION_REAL_CAPTURE)
+
+
 # ── Selection state fixtures ────────────────────────────
 
 SELECTION_BASIC = f"""\
@@ -83,26 +90,28 @@ SELECTION_SCROLLED_AWAY = """\
   line
 """
 
+HRULE_80 = "─" * 80
+PANE_PADDING = "\n" * 16  # blank rows tmux adds below the content
+
 # Permission prompt with tmux pane padding (trailing blank lines)
-SELECTION_PERMISSION_PADDED = (
-    "⏺ Bash(git checkout -- src/app.js)\n"
-    "  ⎿  Running…\n"
-    "\n"
-    "─" * 80 + "\n"
-    " Bash command\n"
-    "\n"
-    "   git checkout -- src/app.js\n"
-    "   Revert app.js to original state\n"
-    "\n"
-    " Do you want to proceed?\n"
-    " ❯ 1. Yes\n"
-    "   2. Yes, and don't ask again for git checkout"
-    " commands\n"
-    "      /Users/lee/Projects/agentdeck\n"
-    "   3. No\n"
-    "\n"
-    " Esc to cancel · Tab to amend · ctrl+e to explain\n" + "\n" * 16  # tmux pane padding
-)
+SELECTION_PERMISSION_PADDED = f"""\
+⏺ Bash(git checkout -- src/app.js)
+  ⎿  Running…
+
+{HRULE_80}
+ Bash command
+
+   git checkout -- src/app.js
+   Revert app.js to original state
+
+ Do you want to proceed?
+ ❯ 1. Yes
+   2. Yes, and don't ask again for git checkout commands
+      /Users/lee/Projects/agentdeck
+   3. No
+
+ Esc to cancel · Tab to amend · ctrl+e to explain
+{PANE_PADDING}"""
 
 # Codex number-input selection (no marker, question ends with :)
 SELECTION_CODEX_NUMBER_INPUT = """\
@@ -193,24 +202,21 @@ class TestSelectionState:
         assert result.selected_index == 1
         assert len(result.items) == 3
 
-    def test_real_capture_no_marker(self, parser):
+    def test_real_capture_no_marker(self, real_capture):
         """Realistic capture without ❯ marker but with footer."""
-        result = parser.parse(SELECTION_REAL_CAPTURE)
-        assert result.state == UIState.SELECTION
-        assert len(result.items) == 6
-        assert result.items[0].label == "Basics & getting started"
-        assert result.items[4].label == "Type something."
-        assert result.items[5].label == "Chat about this"
-        assert result.selected_index == 0  # default
+        assert real_capture.state == UIState.SELECTION
+        assert len(real_capture.items) == 6
+        assert real_capture.items[0].label == "Basics & getting started"
+        assert real_capture.items[4].label == "Type something."
+        assert real_capture.items[5].label == "Chat about this"
+        assert real_capture.selected_index == 0  # default
 
-    def test_real_capture_freeform(self, parser):
-        result = parser.parse(SELECTION_REAL_CAPTURE)
-        assert result.items[4].is_freeform is True
-        assert result.items[4].label == "Type something."
+    def test_real_capture_freeform(self, real_capture):
+        assert real_capture.items[4].is_freeform is True
+        assert real_capture.items[4].label == "Type something."
 
-    def test_real_capture_question(self, parser):
-        result = parser.parse(SELECTION_REAL_CAPTURE)
-        assert "tmux" in result.question
+    def test_real_capture_question(self, real_capture):
+        assert "tmux" in real_capture.question
 
     def test_permission_dialog_no_footer(self, parser):
         """Permission dialog with question header detected."""
@@ -235,11 +241,10 @@ class TestSelectionState:
         assert result.state == UIState.SELECTION
         assert result.arrow_navigable is True
 
-    def test_arrow_navigable_no_marker_with_footer(self, parser):
+    def test_arrow_navigable_no_marker_with_footer(self, real_capture):
         """Selection without marker but with footer → not navigable."""
-        result = parser.parse(SELECTION_REAL_CAPTURE)
-        assert result.state == UIState.SELECTION
-        assert result.arrow_navigable is False
+        assert real_capture.state == UIState.SELECTION
+        assert real_capture.arrow_navigable is False
 
     def test_codex_number_input_selection(self, parser):
         """Codex number-input selection (no marker, colon question)."""
@@ -250,36 +255,33 @@ class TestSelectionState:
         assert result.items[0].label == "Build a quick feature in this repo"
         assert result.items[4].label == "Explain one module in depth"
 
-    def test_scrolled_away_not_selection(self, parser):
-        """Old selection scrolled above bottom 5 → PROMPT."""
-        result = parser.parse(SELECTION_SCROLLED_AWAY)
-        assert result.state == UIState.PROMPT
-
-    def test_numbered_list_no_signal(self, parser):
-        """Numbered list without question or footer → PROMPT."""
-        result = parser.parse(NUMBERED_LIST_NO_SIGNAL)
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            # Old selection scrolled above bottom 5
+            pytest.param(SELECTION_SCROLLED_AWAY, id="scrolled_away"),
+            # Numbered list without question or footer
+            pytest.param(NUMBERED_LIST_NO_SIGNAL, id="numbered_list_no_signal"),
+        ],
+    )
+    def test_not_selection(self, parser, raw):
+        result = parser.parse(raw)
         assert result.state == UIState.PROMPT
 
 
 class TestWorkingState:
-    def test_spinner_unicode_ellipsis(self, parser):
-        result = parser.parse(WORKING_SPINNER)
-        assert result.state == UIState.WORKING
-
-    def test_spinner_colloquial_apostrophe(self, parser):
-        result = parser.parse(WORKING_SPINNER_COLLOQUIAL)
-        assert result.state == UIState.WORKING
-
-    def test_spinner_long_text(self, parser):
-        result = parser.parse(WORKING_SPINNER_LONG_TEXT)
-        assert result.state == UIState.WORKING
-
-    def test_spinner_tool_use(self, parser):
-        result = parser.parse(WORKING_SPINNER_TOOL_USE)
-        assert result.state == UIState.WORKING
-
-    def test_spinner_compact(self, parser):
-        result = parser.parse(WORKING_SPINNER_COMPACT)
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            pytest.param(WORKING_SPINNER, id="unicode_ellipsis"),
+            pytest.param(WORKING_SPINNER_COLLOQUIAL, id="colloquial_apostrophe"),
+            pytest.param(WORKING_SPINNER_LONG_TEXT, id="long_text"),
+            pytest.param(WORKING_SPINNER_TOOL_USE, id="tool_use"),
+            pytest.param(WORKING_SPINNER_COMPACT, id="compact"),
+        ],
+    )
+    def test_spinner(self, parser, raw):
+        result = parser.parse(raw)
         assert result.state == UIState.WORKING
 
     def test_survey_auto_dismiss(self, parser):
@@ -289,18 +291,18 @@ class TestWorkingState:
 
 
 class TestPromptState:
-    def test_basic_prompt(self, parser):
-        result = parser.parse(PROMPT_BASIC)
-        assert result.state == UIState.PROMPT
-
-    def test_empty_is_prompt(self, parser):
-        """Empty input falls through to prompt (default)."""
-        result = parser.parse(PROMPT_EMPTY)
-        assert result.state == UIState.PROMPT
-
-    def test_plain_text_is_prompt(self, parser):
-        """Plain text without spinner falls through to prompt."""
-        result = parser.parse(PROMPT_PLAIN_TEXT)
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            pytest.param(PROMPT_BASIC, id="basic"),
+            # Empty input falls through to prompt (default)
+            pytest.param(PROMPT_EMPTY, id="empty"),
+            # Plain text without spinner falls through to prompt
+            pytest.param(PROMPT_PLAIN_TEXT, id="plain_text"),
+        ],
+    )
+    def test_prompt(self, parser, raw):
+        result = parser.parse(raw)
         assert result.state == UIState.PROMPT
 
 
@@ -336,6 +338,12 @@ class TestEdgeCases:
         result = parser.parse(raw)
         assert result.state == UIState.WORKING
 
+    def test_crlf_line_endings(self, parser):
+        """CRLF captures parse the same as LF ones."""
+        lf = parser.parse(SELECTION_BASIC)
+        crlf = parser.parse(SELECTION_BASIC.replace("\n", "\r\n"))
+        assert crlf == lf
+
 
 class TestBottomUpScanning:
     """Bottom-up scanning finds the current selection near bottom
@@ -406,3 +414,19 @@ Enter to select · ↑/↓ to navigate · Esc to cancel"""
 """
         result = parser.parse(raw)
         assert result.state == UIState.PROMPT
+
+    def test_stale_footer_far_above_is_ignored(self, parser):
+        """A footer deep in scrollback doesn't validate a list at the
+        bottom that has neither a footer nor a question."""
+        scrollback = "\n".join(f"  output line {i}" for i in range(200))
+        raw = f"{FOOTER}\n{scrollback}\n{NUMBERED_LIST_NO_SIGNAL}"
+        result = parser.parse(raw)
+        assert result.state == UIState.PROMPT
+
+    def test_selection_below_long_scrollback(self, parser):
+        """Only the bottom window is parsed; long history doesn't matter."""
+        scrollback = "\n".join(f"  output line {i}" for i in range(2000))
+        result = parser.parse(f"{scrollback}\n{SELECTION_PERMISSION_PADDED}")
+        assert result.state == UIState.SELECTION
+        assert len(result.items) == 3
+        assert result.question == "Do you want to proceed?"